@@ -1,3 +1,6 @@
+import asyncio
+import calendar
+import hashlib
 import logging
 import sys
 import signal
@@ -11,18 +14,16 @@ from telegram.ext import (
     filters,
     ContextTypes,
 )
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import os
 import math
 import sqlite3
 import io
 from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import threading
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import mm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+import time
 
 # Configure logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -45,9 +46,35 @@ ADD_TYPE, CATEGORY, SUBCATEGORY, AMOUNT, DESCRIPTION, EDIT_FIELD, PDF_PERIOD, PD
 # Database file path
 DB_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "finance_tracker.db")
 
+# Finished PDF reports are cached here (least recently used files are evicted past the size cap)
+PDF_CACHE_DIR = os.path.join(os.path.dirname(DB_FILE), "pdf_cache")
+PDF_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Turned off if the cache can't be cleared at startup (its files may predate the current data versions)
+pdf_cache_enabled = True
+
+# Per-user data version, bumped on every write so cached PDFs and per-date listings are never served stale
+user_data_versions = {}
+
+# Current year with the monotonic time it was read at (refreshed at most once a minute)
+current_year_cache = {"checked_at": float("-inf"), "year": 0}
+
 # Thread-local storage for database connections
 thread_local = threading.local()
 
+# Worker threads for PDF rendering (keeps ReportLab off the event loop)
+pdf_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf")
+
+# Single writer thread: database writes run off the event loop and never contend with each other
+db_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+
+# Queued writes are committed together, up to this many per transaction
+WRITE_BATCH_SIZE = 50
+
+# Pending (func, args, future) writes for the batch writer (created when the bot starts); None stops it
+write_queue = None
+write_queue_task = None
+
 # Database column names
 class DBColumns:
     ID = "id"
@@ -58,6 +85,122 @@ class DBColumns:
     AMOUNT = "amount"
     DESCRIPTION = "description"
 
+# Tables holding user entries
+ENTRY_TABLES = ("expenses", "incomes", "investments")
+
+# Entry type shown to the user for each table
+ENTRY_TYPE_NAMES = {"expenses": "Expense", "incomes": "Income", "investments": "Investment"}
+
+# SQL statements per table, built once at import so every call reuses the same text
+# Entries in a date range, newest first, capped at LISTING_MAX_ENTRIES rows for the edit/delete listings
+LISTING_PERIOD_SQL = {
+    table: f"""
+        SELECT * FROM {table}
+        WHERE user_id = ? AND date >= ? AND date <= ?
+        ORDER BY date DESC, time DESC
+        LIMIT ?
+    """
+    for table in ENTRY_TABLES
+}
+
+INSERT_ENTRY_SQL = {
+    table: f"""
+        INSERT INTO {table} (user_id, date, time, category, subcategory, amount, description)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    for table in ENTRY_TABLES
+}
+
+# Returns the deleted row (none if it was already gone)
+DELETE_ENTRY_SQL = {
+    table: f"""
+        DELETE FROM {table} WHERE id = ? AND user_id = ?
+        RETURNING category, subcategory, amount, description
+    """
+    for table in ENTRY_TABLES
+}
+
+# Keyed by (table, field); only these fields can be edited. Returns the updated row.
+UPDATE_ENTRY_FIELD_SQL = {
+    (table, field): f"""
+        UPDATE {table} SET {field} = ? WHERE id = ? AND user_id = ?
+        RETURNING category, subcategory, amount, description
+    """
+    for table in ENTRY_TABLES
+    for field in ("amount", "description")
+}
+
+PERIOD_TOTAL_SQL = {
+    table: f"""
+        SELECT COALESCE(SUM(amount), 0) as total, COUNT(*) as count FROM {table}
+        WHERE user_id = ? AND date >= ? AND date <= ?
+    """
+    for table in ENTRY_TABLES
+}
+
+PERIOD_LISTING_SQL = {
+    table: f"""
+        SELECT date, category, subcategory, amount FROM {table}
+        WHERE user_id = ? AND date >= ? AND date <= ?
+        ORDER BY date DESC, time DESC
+    """
+    for table in ENTRY_TABLES
+}
+
+# Per-category totals of all entry types for a period, tagged with their kind. Each kind also
+# gets a rollup row (category and subcategory NULL) holding its grand total and entry count.
+SUMMARY_TOTALS_SQL = """
+    SELECT 'expense' AS kind, category, subcategory, SUM(amount) AS total, COUNT(*) AS count
+    FROM expenses
+    WHERE user_id = ? AND date >= ? AND date <= ? AND category != 'Invest'
+    GROUP BY category, subcategory
+    UNION ALL
+    SELECT 'expense', NULL, NULL, COALESCE(SUM(amount), 0), COUNT(*)
+    FROM expenses
+    WHERE user_id = ? AND date >= ? AND date <= ? AND category != 'Invest'
+    UNION ALL
+    SELECT 'invest' AS kind, category, subcategory, SUM(amount) AS total, COUNT(*) AS count
+    FROM investments
+    WHERE user_id = ? AND date >= ? AND date <= ?
+    GROUP BY category, subcategory
+    UNION ALL
+    SELECT 'invest', NULL, NULL, COALESCE(SUM(amount), 0), COUNT(*)
+    FROM investments
+    WHERE user_id = ? AND date >= ? AND date <= ?
+    UNION ALL
+    SELECT 'income' AS kind, category, subcategory, SUM(amount) AS total, COUNT(*) AS count
+    FROM incomes
+    WHERE user_id = ? AND date >= ? AND date <= ?
+    GROUP BY category, subcategory
+    UNION ALL
+    SELECT 'income', NULL, NULL, COALESCE(SUM(amount), 0), COUNT(*)
+    FROM incomes
+    WHERE user_id = ? AND date >= ? AND date <= ?
+    ORDER BY category, subcategory
+"""
+
+# Whether a user has any summary entries in a period (stops at the first matching index entry)
+PERIOD_HAS_ENTRIES_SQL = """
+    SELECT EXISTS(SELECT 1 FROM expenses WHERE user_id = ? AND date >= ? AND date <= ? AND category != 'Invest')
+        OR EXISTS(SELECT 1 FROM investments WHERE user_id = ? AND date >= ? AND date <= ?)
+        OR EXISTS(SELECT 1 FROM incomes WHERE user_id = ? AND date >= ? AND date <= ?)
+"""
+
+# All-time count and sum per entry table for /stats in one round trip (expenses skip legacy Invest rows)
+ALLTIME_TOTALS_SQL = """
+    SELECT 'expenses' AS kind, COUNT(*) AS total_count, COALESCE(SUM(amount), 0) AS total_amount
+    FROM expenses WHERE user_id = ? AND category != 'Invest'
+    UNION ALL
+    SELECT 'investments', COUNT(*), COALESCE(SUM(amount), 0) FROM investments WHERE user_id = ?
+    UNION ALL
+    SELECT 'incomes', COUNT(*), COALESCE(SUM(amount), 0) FROM incomes WHERE user_id = ?
+"""
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+DB_CACHED_STATEMENTS = 256
+# Memory-map up to 256MB of the database file so hot pages are read without a syscall
+DB_MMAP_SIZE = 256 * 1024 * 1024
+
 # Month mappings (English, Portuguese, and numbers)
 MONTH_MAPPINGS = {
     'january': '01', 'janeiro': '01', '1': '01',
@@ -74,17 +217,91 @@ MONTH_MAPPINGS = {
     'december': '12', 'dezembro': '12', '12': '12'
 }
 
-MONTH_NAMES = {
-    '01': 'January', '02': 'February', '03': 'March',
-    '04': 'April', '05': 'May', '06': 'June',
-    '07': 'July', '08': 'August', '09': 'September',
-    '10': 'October', '11': 'November', '12': 'December'
-}
+# Month names indexed by month number (index 0 unused)
+MONTH_NAMES = (
+    '', 'January', 'February', 'March',
+    'April', 'May', 'June',
+    'July', 'August', 'September',
+    'October', 'November', 'December'
+)
+
+# Year keyboard buttons look like "📊 2026" (a bare year is accepted too)
+YEAR_PATTERN = re.compile(r"^(?:📊\s*)?(\d{4})$")
+
+# Plain decimal amounts like "12", "12.5" or ".5" (sign allowed so negatives get the "must be positive" reply)
+AMOUNT_PATTERN = re.compile(r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)")
+
+# PDF detail tables are split into chunks of this many rows (keeps layout cost linear)
+PDF_TABLE_CHUNK_ROWS = 50
+# Fixed detail row height in points (8pt font + default leading and cell padding)
+PDF_DETAIL_ROW_HEIGHT = 16
+# Descriptions longer than this are truncated (with "...") in PDF detail tables
+PDF_DESCRIPTION_LENGTH = 25
+
+# Emoji prefixes on category/subcategory buttons (see add_emoji_to_keyboard)
+KEYBOARD_EMOJI_PREFIXES = ("💸 ", "💵 ", "📈 ")
 
 # Validation constants
 MAX_AMOUNT = 999999
 MAX_DESCRIPTION = 200
 MAX_SUBSCRIPTION = 50
+# Entry details shown in edit/delete confirmations (filled with format_map from a row or dict)
+ENTRY_CARD = (
+    "📋 Category: {category}\n"
+    "🏷️ Subcategory: {subcategory}\n"
+    "💵 Amount: €{amount:.2f}\n"
+    "📝 Description: {description}"
+)
+
+# Most recent entries shown per table in edit/delete listings (keeps replies under Telegram's 4096 chars)
+LISTING_MAX_ENTRIES = 25
+LISTING_LIMIT_HINT = f"\n⚠️ Only the {LISTING_MAX_ENTRIES} most recent entries of each type are shown. Pick a shorter period to see older ones."
+
+# Static replies, built once at import
+WELCOME_TEXT = (
+    "👋 Welcome to your Expense & Income Tracker! 📊\n\n"
+    "I'll help you track your finances easily.\n\n"
+    "Use /help to see all available commands.\n\n"
+    "Let's add an entry! Please select a type:\n\n"
+    "💡 Use /cancel to stop."
+)
+
+HELP_TEXT = (
+    "🤖 **Finance Tracker - Help**\n\n"
+    "━━━━━━━━━━━━━━━━━━\n\n"
+    "🔑 **KEY TYPES**\n"
+    "• Expenses\n"
+    "• Invest\n"
+    "• Income\n\n"
+
+    "✨ **GETTING STARTED**\n"
+    "• /add → Add new expense, income or investment\n"
+    "• /categories → See all categories\n\n"
+
+    "📊 **VIEW YOUR DATA**\n"
+    "• /expense → View expenses by period\n"
+    "• /invest → View investments by period\n"
+    "• /income → View incomes by period\n"
+    "• /summary → Financial summary\n"
+    "• /stats → Detailed statistics\n\n"
+
+    "✏️ **MANAGE ENTRIES**\n"
+    "• /edit → Modify an entry (period-based)\n"
+    "• /delete → Remove an entry (period-based)\n"
+    "• /search → Find by category\n"
+    "  _Example: /search groceries_\n\n"
+
+    "📄 **EXPORT**\n"
+    "• /pdf → Generate PDF report\n\n"
+
+    "━━━━━━━━━━━━━━━━━━\n\n"
+    "💡 **Tips:**\n"
+    "• Use /cancel anytime to stop\n"
+    "• Commands guide you step-by-step\n"
+    "• All data is saved automatically\n\n"
+
+    "Happy tracking! 📈💰"
+)
 
 # Entry type selection
 ENTRY_TYPE_OPTIONS = [
@@ -158,7 +375,48 @@ SUBCATEGORIES = {
     ]
 }
 
-DESCRIPTION_REQUIRED_CATEGORIES = {"Lazer", "Needs", "Others"}
+# Emojis shown next to each expense category in /categories
+CATEGORY_EMOJIS = {
+    "Home": "🏠",
+    "Car": "🚗",
+    "Lazer": "🎮",
+    "Travel": "✈️",
+    "Needs": "🛒",
+    "Health": "🏥",
+    "Subscriptions": "📺",
+    "Others": "📦"
+}
+
+
+def build_categories_text() -> str:
+    """Build the /categories listing from the category constants"""
+    lines = ["📂 All Categories & Subcategories\n", "💸 EXPENSES:\n"]
+    
+    for category in CATEGORY_EMOJIS:
+        if category not in SUBCATEGORIES:
+            continue
+        lines.append(f"{CATEGORY_EMOJIS[category]} {category}")
+        if category == "Subscriptions":
+            lines.append("   → (Free text input)\n")
+        else:
+            lines.extend(f"   • {sub}" for row in SUBCATEGORIES[category] for sub in row)
+            lines.append("")
+    
+    lines.append("💵 INCOMES:\n")
+    lines.extend(f"   • {sub}" for row in SUBCATEGORIES.get("Incomes", ()) for sub in row)
+    lines.append("\n📈 INVEST:\n")
+    lines.extend(f"   • {sub}" for row in SUBCATEGORIES.get("Invest", ()) for sub in row)
+    lines.append("\n💡 Use /add to create a new entry!")
+    return "\n".join(lines)
+
+
+# The /categories reply only depends on the constants above, so it's built once
+CATEGORIES_TEXT = build_categories_text()
+
+DESCRIPTION_REQUIRED_CATEGORIES = frozenset({"Lazer", "Needs", "Others"})
+
+# Individual (category, subcategory) pairs that require a description
+DESCRIPTION_REQUIRED_SUBCATEGORIES = frozenset({("Invest", "Ajuntamento")})
 
 # Categories that require free-text subcategory input
 TEXT_SUBCATEGORY_CATEGORIES = {
@@ -166,23 +424,69 @@ TEXT_SUBCATEGORY_CATEGORIES = {
 }
 
 
+def add_emoji_to_keyboard(keyboard: list, emoji: str) -> list:
+    """Add emoji prefix to all buttons in keyboard"""
+    return [[f"{emoji} {btn}" for btn in row] for row in keyboard]
+
+
+# Static reply keyboards, built once and shared by every chat (markups are immutable)
+ENTRY_TYPE_KEYBOARD = ReplyKeyboardMarkup(ENTRY_TYPE_OPTIONS, one_time_keyboard=True)
+
+PERIOD_KEYBOARD = ReplyKeyboardMarkup(
+    [
+        ["📅 Today", "📆 Specific Day"],
+        ["📊 Month", "📈 Year"],
+        ["❌ Cancel"]
+    ],
+    one_time_keyboard=True,
+    resize_keyboard=True
+)
+
+PDF_PERIOD_KEYBOARD = ReplyKeyboardMarkup(
+    [
+        ["📅 This Week", "📆 Choose Month"],
+        ["📊 Choose Year", "❌ Cancel"]
+    ],
+    one_time_keyboard=True,
+    resize_keyboard=True
+)
+
+EXPENSE_CATEGORY_KEYBOARD = ReplyKeyboardMarkup(add_emoji_to_keyboard(EXPENSE_CATEGORIES, "💸"), one_time_keyboard=True)
+INCOME_SUBCATEGORY_KEYBOARD = ReplyKeyboardMarkup(add_emoji_to_keyboard(SUBCATEGORIES["Incomes"], "💵"), one_time_keyboard=True)
+INVEST_SUBCATEGORY_KEYBOARD = ReplyKeyboardMarkup(add_emoji_to_keyboard(SUBCATEGORIES["Invest"], "📈"), one_time_keyboard=True)
+
+# Subcategory keyboard shown after picking an expense category
+SUBCATEGORY_KEYBOARDS = {
+    category: ReplyKeyboardMarkup(add_emoji_to_keyboard(subcats, "💸"), one_time_keyboard=True)
+    for category, subcats in SUBCATEGORIES.items()
+}
+
+
 def should_require_description(category: str, subcategory: str) -> bool:
     """Check if description is required for this category/subcategory"""
-    if category in DESCRIPTION_REQUIRED_CATEGORIES:
-        return True
-    if category == "Invest" and subcategory == "Ajuntamento":
-        return True
-    return False
+    return category in DESCRIPTION_REQUIRED_CATEGORIES or (category, subcategory) in DESCRIPTION_REQUIRED_SUBCATEGORIES
 
 
 def get_today_date() -> str:
     """Get today's date in YYYY-MM-DD format"""
-    return datetime.now().strftime("%Y-%m-%d")
+    return date.today().isoformat()
 
 
-def add_emoji_to_keyboard(keyboard: list, emoji: str) -> list:
-    """Add emoji prefix to all buttons in keyboard"""
-    return [[f"{emoji} {btn}" for btn in row] for row in keyboard]
+def get_current_year() -> int:
+    """Get current year, re-reading the clock at most once a minute"""
+    now = time.monotonic()
+    if now - current_year_cache["checked_at"] > 60:
+        current_year_cache["year"] = date.today().year
+        current_year_cache["checked_at"] = now
+    return current_year_cache["year"]
+
+
+def strip_keyboard_emoji(text: str) -> str:
+    """Strip whitespace and the emoji prefix added by add_emoji_to_keyboard in a single pass"""
+    text = text.strip()
+    if text.startswith(KEYBOARD_EMOJI_PREFIXES):
+        return text[2:].lstrip()
+    return text
 
 
 @contextmanager
@@ -190,8 +494,13 @@ def get_db_connection():
     """Get thread-safe database connection with automatic commit/rollback"""
     # Use thread-local storage to ensure each thread has its own connection
     if not hasattr(thread_local, "connection"):
-        thread_local.connection = sqlite3.connect(DB_FILE, check_same_thread=False)
-        thread_local.connection.row_factory = sqlite3.Row
+        conn = sqlite3.connect(DB_FILE, check_same_thread=False, cached_statements=DB_CACHED_STATEMENTS)
+        conn.row_factory = sqlite3.Row
+        # ~20MB page cache; NORMAL sync is durable enough under WAL and skips an fsync per commit
+        conn.execute("PRAGMA cache_size=-20000")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+        thread_local.connection = conn
     
     conn = thread_local.connection
     try:
@@ -202,6 +511,22 @@ def get_db_connection():
         raise
 
 
+@contextmanager
+def get_db_readonly_connection():
+    """Get thread-local read-only database connection for report and listing queries"""
+    # With WAL, readers on this connection never wait on a concurrent write
+    if not hasattr(thread_local, "readonly_connection"):
+        conn = sqlite3.connect(f"file:{DB_FILE}?mode=ro", uri=True, check_same_thread=False,
+                               cached_statements=DB_CACHED_STATEMENTS)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA cache_size=-20000")
+        conn.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+        thread_local.readonly_connection = conn
+    
+    yield thread_local.readonly_connection
+
+
 def format_success_message(category: str, subcategory: str, amount: float, description: str, target_date: str = None, is_income: bool = False) -> str:
     """Format a standardized success message for saved expenses/incomes"""
     date_msg = f" for {target_date}" if target_date else ""
@@ -240,91 +565,147 @@ def format_expense_numbered(index: int, row) -> str:
     return f"{index}. {row['category']} > {row['subcategory']}: €{row['amount']:.2f} - {row['description']}"
 
 
+def format_period_entry_numbered(index: int, emoji: str, row) -> str:
+    """Format a numbered, dated entry line for the edit/delete period listings"""
+    return f"{index}. {emoji} {row['date']} | {row['category']} > {row['subcategory']}: €{row['amount']:.2f}"
+
+
 def get_week_dates():
     """Get start and end dates for the current week (Monday to Sunday)"""
-    today = datetime.now()
+    today = date.today()
     start_of_week = today - timedelta(days=today.weekday())
     end_of_week = start_of_week + timedelta(days=6)
-    return start_of_week.strftime("%Y-%m-%d"), end_of_week.strftime("%Y-%m-%d")
+    return start_of_week.isoformat(), end_of_week.isoformat()
 
 
 def get_month_dates():
     """Get start and end dates for the current month"""
-    today = datetime.now()
-    start_of_month = today.replace(day=1)
-    # Get last day of month
-    if today.month == 12:
-        end_of_month = today.replace(year=today.year + 1, month=1, day=1) - timedelta(days=1)
-    else:
-        end_of_month = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
-    return start_of_month.strftime("%Y-%m-%d"), end_of_month.strftime("%Y-%m-%d")
+    today = date.today()
+    last_day = calendar.monthrange(today.year, today.month)[1]
+    return today.replace(day=1).isoformat(), today.replace(day=last_day).isoformat()
 
 
 def get_year_dates():
     """Get start and end dates for the current year"""
-    today = datetime.now()
+    today = date.today()
     start_of_year = today.replace(month=1, day=1)
     end_of_year = today.replace(month=12, day=31)
-    return start_of_year.strftime("%Y-%m-%d"), end_of_year.strftime("%Y-%m-%d")
+    return start_of_year.isoformat(), end_of_year.isoformat()
 
 
-def get_entries_for_period(start_date: str, end_date: str, user_id: int, table: str = "expenses"):
-    """Get entries between two dates for a user"""
-    with get_db_connection() as conn:
+def get_all_entries_for_period(user_id: int, start_date: str, end_date: str):
+    """Get expenses and incomes between two dates for a PDF report in a single query.
+    
+    Returns plain tuples (kind, date, category, subcategory, amount, description) where kind is
+    'expense' or 'income' and descriptions are already truncated by SQLite.
+    """
+    params = (PDF_DESCRIPTION_LENGTH, PDF_DESCRIPTION_LENGTH, user_id, start_date, end_date)
+    with get_db_readonly_connection() as conn:
+        cursor = conn.cursor()
+        # Plain tuples are cheaper than sqlite3.Row for the large report result set
+        cursor.row_factory = None
+        cursor.execute("""
+            SELECT kind, date, category, subcategory, amount, description FROM (
+                SELECT 'expense' AS kind, date, time, category, subcategory, amount,
+                       substr(description, 1, ?) || CASE WHEN length(description) > ? THEN '...' ELSE '' END AS description
+                FROM expenses
+                WHERE user_id = ? AND date >= ? AND date <= ?
+                UNION ALL
+                SELECT 'income' AS kind, date, time, category, subcategory, amount,
+                       substr(description, 1, ?) || CASE WHEN length(description) > ? THEN '...' ELSE '' END AS description
+                FROM incomes
+                WHERE user_id = ? AND date >= ? AND date <= ?
+            )
+            ORDER BY date DESC, time DESC
+        """, params + params)
+        return cursor.fetchall()
+
+
+def get_category_totals(user_id: int, start_date: str, end_date: str, table: str = "expenses") -> list:
+    """Get per-category totals between two dates for a user, largest first"""
+    with get_db_readonly_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(f"""
-            SELECT * FROM {table}
+            SELECT category, SUM(amount) as total FROM {table}
             WHERE user_id = ? AND date >= ? AND date <= ?
-            ORDER BY date DESC, time DESC
+            GROUP BY category
+            ORDER BY total DESC
         """, (user_id, start_date, end_date))
-        return cursor.fetchall()
+        return [(row['category'], row['total']) for row in cursor]
+
+
+def get_period_total(user_id: int, start_date: str, end_date: str, table: str = "expenses") -> float:
+    """Get the sum of all amounts between two dates for a user"""
+    with get_db_readonly_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(PERIOD_TOTAL_SQL[table], (user_id, start_date, end_date))
+        return cursor.fetchone()[0]
+
+
+def get_period_count(user_id: int, start_date: str, end_date: str, table: str = "expenses") -> int:
+    """Get the number of entries between two dates for a user"""
+    with get_db_readonly_connection() as conn:
+        return conn.execute(PERIOD_TOTAL_SQL[table], (user_id, start_date, end_date)).fetchone()["count"]
 
 
 def get_available_months(user_id: int) -> list:
     """Get list of months that have data for a user (from both expenses and incomes)"""
-    with get_db_connection() as conn:
+    with get_db_readonly_connection() as conn:
         cursor = conn.cursor()
         # Get unique year-month combinations from expenses, incomes and investments
+        # (UNION ALL plus one GROUP BY dedups and sorts in a single pass instead of once per branch)
         cursor.execute("""
-            SELECT DISTINCT substr(date, 1, 7) as month FROM expenses WHERE user_id = ?
-            UNION
-            SELECT DISTINCT substr(date, 1, 7) as month FROM incomes WHERE user_id = ?
-            UNION
-            SELECT DISTINCT substr(date, 1, 7) as month FROM investments WHERE user_id = ?
+            SELECT month FROM (
+                SELECT substr(date, 1, 7) as month FROM expenses WHERE user_id = ?
+                UNION ALL
+                SELECT substr(date, 1, 7) FROM incomes WHERE user_id = ?
+                UNION ALL
+                SELECT substr(date, 1, 7) FROM investments WHERE user_id = ?
+            )
+            GROUP BY month
             ORDER BY month DESC
         """, (user_id, user_id, user_id))
-        results = cursor.fetchall()
-        return [row[0] for row in results]  # Returns list like ['2026-01', '2025-12', ...]
+        return [row[0] for row in cursor]  # Returns list like ['2026-01', '2025-12', ...]
 
 
 def get_available_years(user_id: int) -> list:
     """Get list of years that have data for a user"""
-    with get_db_connection() as conn:
+    with get_db_readonly_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
-            SELECT DISTINCT substr(date, 1, 4) as year FROM expenses WHERE user_id = ?
-            UNION
-            SELECT DISTINCT substr(date, 1, 4) as year FROM incomes WHERE user_id = ?
-            UNION
-            SELECT DISTINCT substr(date, 1, 4) as year FROM investments WHERE user_id = ?
+            SELECT year FROM (
+                SELECT substr(date, 1, 4) as year FROM expenses WHERE user_id = ?
+                UNION ALL
+                SELECT substr(date, 1, 4) FROM incomes WHERE user_id = ?
+                UNION ALL
+                SELECT substr(date, 1, 4) FROM investments WHERE user_id = ?
+            )
+            GROUP BY year
             ORDER BY year DESC
         """, (user_id, user_id, user_id))
-        results = cursor.fetchall()
-        return [row[0] for row in results]  # Returns list like ['2026', '2025', ...]
+        return [row[0] for row in cursor]  # Returns list like ['2026', '2025', ...]
+
+
+def parse_short_date(date_text: str) -> str:
+    """Parse a stripped DD/MM/YY date into YYYY-MM-DD, raising ValueError on anything else.
+    
+    Accepts the same ASCII input as strptime(..., "%d/%m/%y"): one or two digits for day and
+    month, exactly two for the year. Non-ASCII digits are always rejected.
+    """
+    parts = date_text.split('/')
+    if (len(parts) != 3 or len(parts[2]) != 2
+            or not all(1 <= len(part) <= 2 and part.isascii() and part.isdigit() for part in parts)):
+        raise ValueError(f"invalid date: {date_text!r}")
+    day, month, year = map(int, parts)
+    # Same two-digit year pivot as %y: 69-99 -> 1900s, 00-68 -> 2000s
+    year += 1900 if year >= 69 else 2000
+    return date(year, month, day).isoformat()
 
 
 def get_month_date_range(year_month: str) -> tuple:
     """Get start and end dates for a specific month (YYYY-MM format)"""
-    year, month = int(year_month[:4]), int(year_month[5:7])
-    start_date = f"{year_month}-01"
-    # Get last day of month
-    if month == 12:
-        end_date = f"{year}-12-31"
-    else:
-        next_month = datetime(year, month + 1, 1)
-        last_day = (next_month - timedelta(days=1)).day
-        end_date = f"{year_month}-{last_day:02d}"
-    return start_date, end_date
+    last_day = calendar.monthrange(int(year_month[:4]), int(year_month[5:7]))[1]
+    return f"{year_month}-01", f"{year_month}-{last_day:02d}"
 
 
 def get_year_date_range(year: str) -> tuple:
@@ -332,21 +713,93 @@ def get_year_date_range(year: str) -> tuple:
     return f"{year}-01-01", f"{year}-12-31"
 
 
+@lru_cache(maxsize=2048)
 def format_month_for_display(year_month: str) -> str:
     """Format YYYY-MM to readable format like 'January 2026'"""
-    year, month = year_month[:4], year_month[5:7]
-    month_names = {
-        '01': 'January', '02': 'February', '03': 'March', '04': 'April',
-        '05': 'May', '06': 'June', '07': 'July', '08': 'August',
-        '09': 'September', '10': 'October', '11': 'November', '12': 'December'
-    }
-    return f"{month_names.get(month, month)} {year}"
+    return f"{MONTH_NAMES[int(year_month[5:7])]} {year_month[:4]}"
+
 
+@lru_cache(maxsize=1024)
+def get_month_display_mapping(months: tuple) -> dict:
+    """Map display labels like 'January 2026' to YYYY-MM for month keyboards (shared, don't mutate)"""
+    return dict(zip(map(format_month_for_display, months), months))
 
-def generate_pdf_report(expenses: list, incomes: list, period_name: str, start_date: str, end_date: str) -> io.BytesIO:
-    """Generate a PDF report with expenses and incomes"""
+
+def build_month_keyboard(months: list) -> list:
+    """Build a two-column keyboard of the latest 12 months plus a Cancel row"""
+    labels = [format_month_for_display(m) for m in months[:12]]
+    keyboard = [labels[i:i + 2] for i in range(0, len(labels), 2)]
+    keyboard.append(["❌ Cancel"])
+    return keyboard
+
+
+def build_year_keyboard(years: list) -> list:
+    """Build a two-column keyboard of years (as "📊 2026" buttons) plus a Cancel row"""
+    labels = [f"📊 {year}" for year in years]
+    keyboard = [labels[i:i + 2] for i in range(0, len(labels), 2)]
+    keyboard.append(["❌ Cancel"])
+    return keyboard
+
+
+def parse_year_choice(choice: str):
+    """Get the YYYY year from a year keyboard button, or None if the choice isn't a year"""
+    match = YEAR_PATTERN.match(choice)
+    return match.group(1) if match else None
+
+
+def build_pdf_detail_tables(rows: list, header_color, row_colors: list) -> list:
+    """Build detail tables in fixed-size chunks, each repeating the header row.
+    
+    Rows are (date, category, subcategory, amount, description) tuples.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.units import mm
+    from reportlab.platypus import LongTable, TableStyle
+    
+    header = ['Date', 'Category', 'Subcategory', 'Amount', 'Description']
+    style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), header_color),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), row_colors),
+    ])
+    
+    # Format every cell once up front so tables never re-measure or re-truncate
+    body = [
+        [entry_date, category, subcategory, f"€{amount:.2f}", description]
+        for entry_date, category, subcategory, amount, description in rows
+    ]
+    
+    tables = []
+    for start in range(0, len(body), PDF_TABLE_CHUNK_ROWS):
+        data = [header] + body[start:start + PDF_TABLE_CHUNK_ROWS]
+        table = LongTable(
+            data,
+            colWidths=[25*mm, 30*mm, 30*mm, 22*mm, 43*mm],
+            rowHeights=[PDF_DETAIL_ROW_HEIGHT] * len(data),
+            splitByRow=1,
+            repeatRows=1
+        )
+        table.setStyle(style)
+        tables.append(table)
+    return tables
+
+
+def generate_pdf_report(expenses: list, incomes: list, category_totals: list, total_expenses: float, total_incomes: float,
+                        period_name: str, start_date: str, end_date: str, generated_on: str) -> io.BytesIO:
+    """Generate a PDF report with expenses and incomes (totals are pre-aggregated in SQL)"""
+    # ReportLab is only imported when a report is actually generated, keeping bot startup light
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import mm
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=20*mm, bottomMargin=20*mm)
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=20*mm, bottomMargin=20*mm, _pageBreakQuick=1)
     styles = getSampleStyleSheet()
     elements = []
     
@@ -377,9 +830,7 @@ def generate_pdf_report(expenses: list, incomes: list, period_name: str, start_d
     elements.append(period_info)
     elements.append(Spacer(1, 10*mm))
     
-    # Calculate totals
-    total_expenses = sum(row['amount'] for row in expenses) if expenses else 0
-    total_incomes = sum(row['amount'] for row in incomes) if incomes else 0
+    # Totals
     balance = total_incomes - total_expenses
     
     # Summary section
@@ -414,14 +865,9 @@ def generate_pdf_report(expenses: list, incomes: list, period_name: str, start_d
         expenses_header = Paragraph("📉 Expenses by Category", header_style)
         elements.append(expenses_header)
         
-        # Group by category
-        category_totals = {}
-        for row in expenses:
-            cat = row['category']
-            category_totals[cat] = category_totals.get(cat, 0) + row['amount']
-        
+        # Category totals arrive already sorted by total (largest first)
         cat_data = [['Category', 'Total']]
-        for cat, total in sorted(category_totals.items(), key=lambda x: x[1], reverse=True):
+        for cat, total in category_totals:
             cat_data.append([cat, f"€{total:.2f}"])
         
         cat_table = Table(cat_data, colWidths=[100*mm, 50*mm])
@@ -440,27 +886,7 @@ def generate_pdf_report(expenses: list, incomes: list, period_name: str, start_d
         expenses_detail_header = Paragraph("📋 Expense Details", header_style)
         elements.append(expenses_detail_header)
         
-        exp_data = [['Date', 'Category', 'Subcategory', 'Amount', 'Description']]
-        for row in expenses:
-            exp_data.append([
-                row['date'],
-                row['category'],
-                row['subcategory'],
-                f"€{row['amount']:.2f}",
-                row['description'][:25] + '...' if len(row['description']) > 25 else row['description']
-            ])
-        
-        exp_table = Table(exp_data, colWidths=[25*mm, 30*mm, 30*mm, 22*mm, 43*mm])
-        exp_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkred),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.white]),
-        ]))
-        elements.append(exp_table)
+        elements.extend(build_pdf_detail_tables(expenses, colors.darkred, [colors.whitesmoke, colors.white]))
         elements.append(Spacer(1, 10*mm))
     
     # Incomes section
@@ -468,31 +894,12 @@ def generate_pdf_report(expenses: list, incomes: list, period_name: str, start_d
         incomes_header = Paragraph("📈 Income Details", header_style)
         elements.append(incomes_header)
         
-        inc_data = [['Date', 'Category', 'Subcategory', 'Amount', 'Description']]
-        for row in incomes:
-            inc_data.append([
-                row['date'],
-                row['category'],
-                row['subcategory'],
-                f"€{row['amount']:.2f}",
-                row['description'][:25] + '...' if len(row['description']) > 25 else row['description']
-            ])
-        
-        inc_table = Table(inc_data, colWidths=[25*mm, 30*mm, 30*mm, 22*mm, 43*mm])
-        inc_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkgreen),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.honeydew, colors.white]),
-        ]))
-        elements.append(inc_table)
+        elements.extend(build_pdf_detail_tables(incomes, colors.darkgreen, [colors.honeydew, colors.white]))
     
     # Footer
     elements.append(Spacer(1, 15*mm))
-    footer = Paragraph(f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M')}", 
+    # Date only: cached reports are keyed per day, so a time of day would go stale on reuse
+    footer = Paragraph(f"Generated on {generated_on}", 
                        ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=colors.grey, alignment=1))
     elements.append(footer)
     
@@ -502,22 +909,91 @@ def generate_pdf_report(expenses: list, incomes: list, period_name: str, start_d
     return buffer
 
 
+def init_pdf_cache():
+    """Create the PDF cache directory and drop reports cached by a previous run"""
+    global pdf_cache_enabled
+    # Data versions live in memory, so files from an earlier process can't be trusted
+    try:
+        os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+        for entry in os.scandir(PDF_CACHE_DIR):
+            if entry.is_file():
+                os.remove(entry.path)
+    except OSError as e:
+        # Non-fatal: reports are just not cached, rather than risk serving a stale one
+        logger.warning(f"Could not initialize PDF cache, caching disabled: {e}")
+        pdf_cache_enabled = False
+
+
+def get_user_data_version(user_id: int) -> int:
+    """Get the version of a user's data, which keys the PDF and per-date listing caches"""
+    return user_data_versions.get(user_id, 0)
+
+
+def bump_user_data_version(user_id: int):
+    """Mark all cached PDF reports and per-date listings of a user as outdated"""
+    user_data_versions[user_id] = get_user_data_version(user_id) + 1
+
+
+def get_pdf_cache_path(user_id: int, start_date: str, end_date: str, period_name: str, generated_on: str) -> str:
+    """Get the cache file path for a report of the user's current data generated on a given day"""
+    key = f"{user_id}:{start_date}:{end_date}:{period_name}:{generated_on}:{get_user_data_version(user_id)}"
+    digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    return os.path.join(PDF_CACHE_DIR, f"{digest}.pdf")
+
+
+def load_cached_pdf(path: str):
+    """Load a cached PDF report, or None if it isn't cached (blocking file I/O, run in pdf_executor)"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        # Refresh mtime, which tracks recency for LRU eviction
+        os.utime(path)
+    except FileNotFoundError:
+        # Missing, or evicted by a concurrent store between the read and the utime
+        return None
+    return io.BytesIO(data)
+
+
+def store_cached_pdf(path: str, buffer: io.BytesIO):
+    """Store a PDF report in the cache and evict least recently used reports over the size cap.
+    
+    Blocking file I/O, run in pdf_executor.
+    """
+    os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(buffer.getvalue())
+    
+    entries = []
+    for entry in os.scandir(PDF_CACHE_DIR):
+        try:
+            if entry.is_file():
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        except FileNotFoundError:
+            # Removed by a concurrent eviction
+            continue
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, entry_path in sorted(entries):
+        if total_size <= PDF_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(entry_path)
+        except FileNotFoundError:
+            pass
+        total_size -= size
+
+
 async def pdf_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Start PDF export conversation"""
     # Clear any previous conversation state
     context.user_data.clear()
     
-    keyboard = [
-        ["📅 This Week", "📆 Choose Month"],
-        ["📊 Choose Year", "❌ Cancel"]
-    ]
-    
     await update.message.reply_text(
         "📄 *PDF Export*\n\n"
         "Choose the period for your financial report:\n\n"
         "💡 Use /cancel to stop.",
         parse_mode="Markdown",
-        reply_markup=ReplyKeyboardMarkup(keyboard, one_time_keyboard=True, resize_keyboard=True)
+        reply_markup=PDF_PERIOD_KEYBOARD
     )
     return PDF_PERIOD
 
@@ -548,19 +1024,15 @@ async def handle_pdf_period(update: Update, context: ContextTypes.DEFAULT_TYPE):
             )
             return ConversationHandler.END
         
-        # Create keyboard with available months (max 12 for display)
-        keyboard = []
-        for i in range(0, min(len(available_months), 12), 2):
-            row = [format_month_for_display(available_months[i])]
-            if i + 1 < len(available_months):
-                row.append(format_month_for_display(available_months[i + 1]))
-            keyboard.append(row)
+        # Create keyboard with available months (max 12 for display), numbered so the
+        # reply can be mapped straight back to a list index
+        months = available_months[:12]
+        buttons = [f"{i}. {format_month_for_display(m)}" for i, m in enumerate(months, start=1)]
+        keyboard = [buttons[i:i + 2] for i in range(0, len(buttons), 2)]
         keyboard.append(["❌ Cancel"])
         
-        # Store mapping for later use
-        context.user_data['month_mapping'] = {
-            format_month_for_display(m): m for m in available_months
-        }
+        # Store the months for later use
+        context.user_data['months'] = months
         
         await update.message.reply_text(
             "📆 *Select Month*\n\n"
@@ -582,13 +1054,7 @@ async def handle_pdf_period(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return ConversationHandler.END
         
         # Create keyboard with available years
-        keyboard = []
-        for i in range(0, len(available_years), 2):
-            row = [f"📊 {available_years[i]}"]
-            if i + 1 < len(available_years):
-                row.append(f"📊 {available_years[i + 1]}")
-            keyboard.append(row)
-        keyboard.append(["❌ Cancel"])
+        keyboard = build_year_keyboard(available_years)
         
         await update.message.reply_text(
             "📊 *Select Year*\n\n"
@@ -610,21 +1076,21 @@ async def handle_pdf_month(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     if "Cancel" in choice:
         await update.message.reply_text("❌ PDF export cancelled.", reply_markup=ReplyKeyboardRemove())
-        context.user_data.pop('month_mapping', None)
+        context.user_data.pop('months', None)
         return ConversationHandler.END
     
-    # Get the YYYY-MM format from mapping
-    month_mapping = context.user_data.get('month_mapping', {})
-    year_month = month_mapping.get(choice)
+    # Get the YYYY-MM format from the button number (e.g., "2. December 2025" -> months[1])
+    months = context.user_data.pop('months', [])
+    prefix = choice.split(".", 1)[0]
     
-    if not year_month:
+    if not (prefix.isascii() and prefix.isdigit()) or not 1 <= int(prefix) <= len(months):
         await update.message.reply_text("❌ Invalid month. Please try again with /pdf")
         return ConversationHandler.END
     
+    year_month = months[int(prefix) - 1]
     start_date, end_date = get_month_date_range(year_month)
-    period_name = choice  # Already formatted like "January 2026"
+    period_name = format_month_for_display(year_month)
     
-    context.user_data.pop('month_mapping', None)
     return await generate_and_send_pdf(update, user_id, start_date, end_date, period_name)
 
 
@@ -638,9 +1104,9 @@ async def handle_pdf_year(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return ConversationHandler.END
     
     # Extract year from choice (e.g., "📊 2026" -> "2026")
-    year = choice.replace("📊 ", "").strip()
+    year = parse_year_choice(choice)
     
-    if not year.isdigit() or len(year) != 4:
+    if not year:
         await update.message.reply_text("❌ Invalid year. Please try again with /pdf")
         return ConversationHandler.END
     
@@ -655,16 +1121,49 @@ async def generate_and_send_pdf(update: Update, user_id: int, start_date: str, e
     await update.message.reply_text("⏳ Generating PDF report...", reply_markup=ReplyKeyboardRemove())
     
     try:
-        # Get data
-        expenses = get_entries_for_period(start_date, end_date, user_id, "expenses")
-        incomes = get_entries_for_period(start_date, end_date, user_id, "incomes")
-        
-        if not expenses and not incomes:
-            await update.message.reply_text(f"📭 No data found for {period_name}.")
-            return ConversationHandler.END
-        
-        # Generate PDF
-        pdf_buffer = generate_pdf_report(expenses, incomes, period_name, start_date, end_date)
+        loop = asyncio.get_running_loop()
+        
+        # Reuse a cached report if the user's data hasn't changed since it was built.
+        # Checked before fetching rows: a cached report implies there was data to report.
+        # Keyed by day too, so the report's "Generated on" date is never stale.
+        generated_on = get_today_date()
+        cache_path = get_pdf_cache_path(user_id, start_date, end_date, period_name, generated_on)
+        pdf_buffer = None
+        if pdf_cache_enabled:
+            pdf_buffer = await loop.run_in_executor(pdf_executor, load_cached_pdf, cache_path)
+        
+        if pdf_buffer is not None:
+            # Only the caption's entry counts are needed; the rows are already in the report
+            expense_count = get_period_count(user_id, start_date, end_date, "expenses")
+            income_count = get_period_count(user_id, start_date, end_date, "incomes")
+        else:
+            # Get data
+            entries = get_all_entries_for_period(user_id, start_date, end_date)
+            expenses = [row[1:] for row in entries if row[0] == 'expense']
+            incomes = [row[1:] for row in entries if row[0] == 'income']
+            
+            if not expenses and not incomes:
+                await update.message.reply_text(f"📭 No data found for {period_name}.")
+                return ConversationHandler.END
+            expense_count, income_count = len(expenses), len(incomes)
+            
+            # Aggregate in SQL instead of re-scanning the rows in Python
+            category_totals = get_category_totals(user_id, start_date, end_date, "expenses")
+            total_expenses = get_period_total(user_id, start_date, end_date, "expenses")
+            total_incomes = get_period_total(user_id, start_date, end_date, "incomes")
+            
+            # Generate PDF in a worker thread with the already-fetched rows (no DB access there)
+            pdf_buffer = await loop.run_in_executor(
+                pdf_executor, generate_pdf_report,
+                expenses, incomes, category_totals, total_expenses, total_incomes,
+                period_name, start_date, end_date, generated_on
+            )
+            
+            if pdf_cache_enabled:
+                try:
+                    await loop.run_in_executor(pdf_executor, store_cached_pdf, cache_path, pdf_buffer)
+                except OSError as e:
+                    logger.warning(f"Could not cache PDF report: {e}")
         
         # Create filename
         filename = f"finance_report_{period_name.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
@@ -675,8 +1174,8 @@ async def generate_and_send_pdf(update: Update, user_id: int, start_date: str, e
             filename=filename,
             caption=f"📊 *Financial Report - {period_name}*\n\n"
                    f"📅 Period: {start_date} to {end_date}\n"
-                   f"📉 Expenses: {len(expenses)} entries\n"
-                   f"📈 Incomes: {len(incomes)} entries",
+                   f"📉 Expenses: {expense_count} entries\n"
+                   f"📈 Incomes: {income_count} entries",
             parse_mode="Markdown"
         )
         
@@ -689,28 +1188,47 @@ async def generate_and_send_pdf(update: Update, user_id: int, start_date: str, e
     return ConversationHandler.END
 
 
-def get_entries_for_date(target_date: str, user_id: int, table: str = "expenses"):
-    """Load entries (expenses or incomes) for a specific date and user from database"""
-    with get_db_connection() as conn:
+def get_listing_entries(user_id: int, start_date: str, end_date: str):
+    """Load the most recent expenses and incomes in a date range for the edit/delete listings"""
+    params = (user_id, start_date, end_date, LISTING_MAX_ENTRIES)
+    with get_db_readonly_connection() as conn:
+        expenses = conn.execute(LISTING_PERIOD_SQL["expenses"], params).fetchall()
+        incomes = conn.execute(LISTING_PERIOD_SQL["incomes"], params).fetchall()
+    return expenses, incomes
+
+
+@lru_cache(maxsize=512)
+def load_entries_for_date(target_date: str, user_id: int, table: str, data_version: int) -> tuple:
+    """Load entries for a date from the database; data_version keys the cache to the user's data"""
+    with get_db_readonly_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(f"""
             SELECT * FROM {table}
             WHERE user_id = ? AND date = ?
             ORDER BY time DESC
-        """, (user_id, target_date))
-        return cursor.fetchall()
+            LIMIT ?
+        """, (user_id, target_date, LISTING_MAX_ENTRIES))
+        return tuple(cursor.fetchall())
+
+
+def get_entries_for_date(target_date: str, user_id: int, table: str = "expenses") -> tuple:
+    """Load the most recent entries (expenses or incomes) for a date and user, cached until the user's data changes"""
+    # Every write bumps the user's version (see bump_user_data_version), so stale results are never hit
+    return load_entries_for_date(target_date, user_id, table, get_user_data_version(user_id))
 
 
 def init_database():
     """Initialize SQLite database with expenses and incomes tables"""
     # Ensure data directory exists
-    data_dir = os.path.dirname(DB_FILE)
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
+    os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
     
     with get_db_connection() as conn:
         cursor = conn.cursor()
         
+        # WAL lets readers run alongside the writer; checkpoint about every 1000 pages (~4MB)
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA wal_autocheckpoint=1000")
+        
         # Create expenses table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS expenses (
@@ -760,55 +1278,178 @@ def init_database():
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_user_date ON expenses(user_id, date)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_incomes_user_date ON incomes(user_id, date)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_investments_user_date ON investments(user_id, date)")
-
-        # One-time migration: move legacy investment rows from expenses to investments
+        
+        # Covering indexes for the PDF report queries (answered from the index without touching the table)
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_expenses_report'")
+        report_indexes_missing = cursor.fetchone() is None
         cursor.execute("""
-            INSERT INTO investments (user_id, date, time, category, subcategory, amount, description, created_at)
-            SELECT user_id, date, time, category, subcategory, amount, description, created_at
-            FROM expenses
-            WHERE category = 'Invest'
+            CREATE INDEX IF NOT EXISTS idx_expenses_report
+            ON expenses(user_id, date DESC, time DESC, category, subcategory, amount, description)
         """)
-        cursor.execute("DELETE FROM expenses WHERE category = 'Invest'")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_incomes_report
+            ON incomes(user_id, date DESC, time DESC, category, subcategory, amount, description)
+        """)
+        if report_indexes_missing:
+            # Refresh planner statistics once so the new indexes get picked
+            cursor.execute("ANALYZE")
+
+        # One-time migration: move legacy investment rows from expenses to investments
+        # (probe first, so startups after the migration skip the copy and delete scans)
+        cursor.execute("SELECT EXISTS(SELECT 1 FROM expenses WHERE category = 'Invest')")
+        if cursor.fetchone()[0]:
+            cursor.execute("""
+                INSERT INTO investments (user_id, date, time, category, subcategory, amount, description, created_at)
+                SELECT user_id, date, time, category, subcategory, amount, description, created_at
+                FROM expenses
+                WHERE category = 'Invest'
+            """)
+            cursor.execute("DELETE FROM expenses WHERE category = 'Invest'")
+            logger.info(f"Moved {cursor.rowcount} legacy investment rows to the investments table")
         
         logger.debug(f"Database initialized: {DB_FILE}")
 
 
-def save_expense(category: str, subcategory: str, amount: float, description: str, user_id: int, custom_date: str = None):
+def get_entry_table(category: str) -> str:
+    """Get the table that stores entries of a category"""
+    if category == "Incomes":
+        return "incomes"
+    if category == "Invest":
+        return "investments"
+    return "expenses"
+
+
+def insert_entry(conn, table: str, values: tuple):
+    """Insert an entry row (runs on the writer thread inside a write batch)"""
+    conn.execute(INSERT_ENTRY_SQL[table], values)
+
+
+def delete_entry(conn, table: str, entry_id: int, user_id: int):
+    """Delete a user's entry and return the deleted row, or None if it's already gone.
+    
+    Runs on the writer thread inside a write batch.
+    """
+    rows = conn.execute(DELETE_ENTRY_SQL[table], (entry_id, user_id)).fetchall()
+    return rows[0] if rows else None
+
+
+def update_entry_field(conn, table: str, field: str, value, entry_id: int, user_id: int):
+    """Update the amount or description of a user's entry and return the updated row, or None if it's gone.
+    
+    Runs on the writer thread inside a write batch.
+    """
+    rows = conn.execute(UPDATE_ENTRY_FIELD_SQL[(table, field)], (value, entry_id, user_id)).fetchall()
+    return rows[0] if rows else None
+
+
+async def save_expense(category: str, subcategory: str, amount: float, description: str, user_id: int, custom_date: str = None):
     """Save expense, income or investment to database for specific user"""
     # Determine target table by category
     is_income = (category == "Incomes")
     is_invest = (category == "Invest")
-    if is_income:
-        table = "incomes"
-    elif is_invest:
-        table = "investments"
-    else:
-        table = "expenses"
+    table = get_entry_table(category)
     
     try:
-        if custom_date:
-            date_str = custom_date
-        else:
-            date_str = datetime.now().strftime("%Y-%m-%d")
+        # Read the clock once so date and time always agree
+        now = datetime.now()
+        date_str = custom_date or now.strftime("%Y-%m-%d")
+        time_str = now.strftime("%H:%M:%S")
         
-        time_str = datetime.now().strftime("%H:%M:%S")
+        await queue_db_write(insert_entry, table, (user_id, date_str, time_str, category, subcategory, amount, description))
         
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"""
-                INSERT INTO {table} (user_id, date, time, category, subcategory, amount, description)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (user_id, date_str, time_str, category, subcategory, amount, description))
-            
-            entry_type = "income" if is_income else "investment" if is_invest else "expense"
-            logger.debug(f"Saved {entry_type} for user {user_id}: {category} > {subcategory} - €{amount} on {date_str}")
-            return True
+        bump_user_data_version(user_id)
+        entry_type = "income" if is_income else "investment" if is_invest else "expense"
+        logger.debug(f"Saved {entry_type} for user {user_id}: {category} > {subcategory} - €{amount} on {date_str}")
+        return True
     except Exception as e:
         entry_type = "income" if is_income else "investment" if is_invest else "expense"
         logger.error(f"Error saving {entry_type}: {e}")
         return False
 
 
+def run_write_batch(batch: list) -> list:
+    """Run queued writes in one transaction, returning an (ok, result) pair per write.
+    
+    If the batch fails, each write is retried in its own transaction so one bad write
+    doesn't fail the others.
+    """
+    try:
+        with get_db_connection() as conn:
+            # Take the write lock up front so the batch never has to upgrade a read lock mid-way
+            conn.execute("BEGIN IMMEDIATE")
+            return [(True, func(conn, *args)) for func, args in batch]
+    except Exception as e:
+        logger.warning(f"Write batch of {len(batch)} failed, retrying writes one by one: {e}")
+    
+    results = []
+    for func, args in batch:
+        try:
+            with get_db_connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                results.append((True, func(conn, *args)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+async def queue_db_write(func, *args):
+    """Queue a write for the batch writer and wait for its result.
+    
+    func is called on the writer thread as func(conn, *args) inside the batch transaction.
+    """
+    future = asyncio.get_running_loop().create_future()
+    await write_queue.put((func, args, future))
+    return await future
+
+
+async def process_write_queue():
+    """Commit queued writes in batches: everything queued while a batch runs goes into the next one.
+    
+    Returns once the None sentinel is dequeued, after committing the writes queued before it.
+    """
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        batch = []
+        item = await write_queue.get()
+        while True:
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+            if len(batch) >= WRITE_BATCH_SIZE or write_queue.empty():
+                break
+            item = write_queue.get_nowait()
+        if not batch:
+            continue
+        
+        results = await loop.run_in_executor(db_writer, run_write_batch, [(func, args) for func, args, _ in batch])
+        for (_, _, future), (ok, result) in zip(batch, results):
+            if future.cancelled():
+                continue
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(result)
+
+
+async def start_write_queue(application: Application):
+    """Create the write queue and start the batch writer once the event loop is running"""
+    global write_queue, write_queue_task
+    write_queue = asyncio.Queue()
+    # Not application.create_task: Application.stop() awaits those, and the writer only ends on the sentinel
+    write_queue_task = asyncio.create_task(process_write_queue())
+
+
+async def stop_write_queue(application: Application):
+    """Commit the writes still queued, then shut down the worker threads"""
+    if write_queue_task is not None:
+        await write_queue.put(None)
+        await write_queue_task
+    db_writer.shutdown(wait=True)
+    pdf_executor.shutdown(wait=True)
+
+
 async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Search for expenses/incomes by category or subcategory"""
     try:
@@ -833,35 +1474,51 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         search_term = parts[1].strip()
         
-        # Search in expenses, investments and incomes
+        search_pattern = f"%{search_term}%"
+        params = (user_id, search_pattern, search_pattern)
+        
+        # Search in expenses, investments and incomes, formatting rows straight off the cursor
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
             
             # Search expenses
+            expense_lines = []
+            expense_total = 0.0
             cursor.execute("""
-                SELECT 'expense' as type, * FROM expenses
+                SELECT date, amount FROM expenses
                 WHERE user_id = ? AND (category LIKE ? OR subcategory LIKE ?)
                 ORDER BY date DESC, time DESC
-            """, (user_id, f"%{search_term}%", f"%{search_term}%"))
-            expenses = cursor.fetchall()
+            """, params)
+            for entry_date, amount in cursor:
+                expense_total += amount
+                expense_lines.append(f"• {entry_date} | €{amount:.2f}\n")
 
             # Search investments
+            invest_lines = []
+            invest_total = 0.0
             cursor.execute("""
-                SELECT 'invest' as type, * FROM investments
+                SELECT date, category, subcategory, amount FROM investments
                 WHERE user_id = ? AND (category LIKE ? OR subcategory LIKE ?)
                 ORDER BY date DESC, time DESC
-            """, (user_id, f"%{search_term}%", f"%{search_term}%"))
-            invests = cursor.fetchall()
+            """, params)
+            for entry_date, category, subcategory, amount in cursor:
+                invest_total += amount
+                invest_lines.append(f"• {entry_date} | {category} > {subcategory}: €{amount:.2f}\n")
             
             # Search incomes
+            income_lines = []
+            income_total = 0.0
             cursor.execute("""
-                SELECT 'income' as type, * FROM incomes
+                SELECT date, category, subcategory, amount FROM incomes
                 WHERE user_id = ? AND (category LIKE ? OR subcategory LIKE ?)
                 ORDER BY date DESC, time DESC
-            """, (user_id, f"%{search_term}%", f"%{search_term}%"))
-            incomes = cursor.fetchall()
+            """, params)
+            for entry_date, category, subcategory, amount in cursor:
+                income_total += amount
+                income_lines.append(f"• {entry_date} | {category} > {subcategory}: €{amount:.2f}\n")
         
-        if not expenses and not incomes and not invests:
+        if not expense_lines and not income_lines and not invest_lines:
             await update.message.reply_text(
                 f"🔍 No results found for: **{search_term}**\n\n"
                 "Try searching with a different term.",
@@ -870,39 +1527,27 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return
         
         # Build results message
-        message = f"🔍 **Search Results for: {search_term}**\n\n"
+        parts = [f"🔍 **Search Results for: {search_term}**\n\n"]
         
         # Expenses section
-        if expenses:
-            expense_total = 0.0
-            message += "💸 **Expenses:**\n"
-            for exp in expenses:
-                amount = exp['amount']
-                expense_total += amount
-                message += f"• {exp['date']} | €{amount:.2f}\n"
-            message += f"Total: €{expense_total:.2f}\n\n"
+        if expense_lines:
+            parts.append("💸 **Expenses:**\n")
+            parts.extend(expense_lines)
+            parts.append(f"Total: €{expense_total:.2f}\n\n")
 
         # Investments section
-        if invests:
-            invest_total = 0.0
-            message += "📈 **Investments:**\n"
-            for inv in invests:
-                amount = inv['amount']
-                invest_total += amount
-                message += f"• {inv['date']} | {inv['category']} > {inv['subcategory']}: €{amount:.2f}\n"
-            message += f"Total: €{invest_total:.2f}\n\n"
+        if invest_lines:
+            parts.append("📈 **Investments:**\n")
+            parts.extend(invest_lines)
+            parts.append(f"Total: €{invest_total:.2f}\n\n")
         
         # Incomes section
-        if incomes:
-            income_total = 0.0
-            message += "💵 **Incomes:**\n"
-            for inc in incomes:
-                amount = inc['amount']
-                income_total += amount
-                message += f"• {inc['date']} | {inc['category']} > {inc['subcategory']}: €{amount:.2f}\n"
-            message += f"Total: €{income_total:.2f}"
+        if income_lines:
+            parts.append("💵 **Incomes:**\n")
+            parts.extend(income_lines)
+            parts.append(f"Total: €{income_total:.2f}")
         
-        await update.message.reply_text(message, parse_mode="Markdown")
+        await update.message.reply_text("".join(parts), parse_mode="Markdown")
         
     except Exception as e:
         await handle_error(update, e, "searching entries")
@@ -923,17 +1568,11 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
         return ConversationHandler.END
     
     # Create keyboard with available months
-    keyboard = []
-    for i in range(0, min(len(available_months), 12), 2):
-        row = [format_month_for_display(available_months[i])]
-        if i + 1 < len(available_months):
-            row.append(format_month_for_display(available_months[i + 1]))
-        keyboard.append(row)
-    keyboard.append(["❌ Cancel"])
+    keyboard = build_month_keyboard(available_months)
     
-    # Store mapping for later use
+    # Store mapping for later use (keyed case-insensitively so one lookup matches any casing)
     context.user_data['stats_month_mapping'] = {
-        format_month_for_display(m): m for m in available_months
+        format_month_for_display(m).casefold(): m for m in available_months
     }
     
     await update.message.reply_text(
@@ -958,22 +1597,15 @@ async def handle_stats_month(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     # Get the YYYY-MM format from mapping
     month_mapping = context.user_data.get('stats_month_mapping', {})
-    year_month = month_mapping.get(choice)
+    year_month = month_mapping.get(choice.casefold())
     
     if not year_month:
-        # Try to find a partial match in case there are extra spaces
-        for key, value in month_mapping.items():
-            if key.lower() == choice.lower():
-                year_month = value
-                break
-        
-        if not year_month:
-            logger.warning(f"Stats month not found. Choice: '{choice}'. Available: {list(month_mapping.keys())}")
-            await update.message.reply_text(
-                "❌ Invalid month. Please select a month from the keyboard.",
-                reply_markup=ReplyKeyboardRemove()
-            )
-            return ConversationHandler.END
+        logger.warning(f"Stats month not found. Choice: '{choice}'. Available: {list(month_mapping.keys())}")
+        await update.message.reply_text(
+            "❌ Invalid month. Please select a month from the keyboard.",
+            reply_markup=ReplyKeyboardRemove()
+        )
+        return ConversationHandler.END
     
     context.user_data.pop('stats_month_mapping', None)
     return await generate_and_send_stats(update, user_id, year_month)
@@ -985,12 +1617,8 @@ async def generate_and_send_stats(update: Update, user_id: int, year_month: str)
         year, month = int(year_month[:4]), int(year_month[5:7])
         start_date, end_date = get_month_date_range(year_month)
         
-        # Get last day of month for daily average calculation
-        if month == 12:
-            days_in_month = 31
-        else:
-            next_month = datetime(year, month + 1, 1)
-            days_in_month = (next_month - timedelta(days=1)).day
+        # Days in month for daily average calculation
+        days_in_month = calendar.monthrange(year, month)[1]
         
         with get_db_connection() as conn:
             cursor = conn.cursor()
@@ -1025,31 +1653,12 @@ async def generate_and_send_stats(update: Update, user_id: int, year_month: str)
             """, (user_id, start_date, end_date))
             income_categories = cursor.fetchall()
             
-            # Get all-time stats (expenses excluding investments)
-            cursor.execute("""
-                SELECT COUNT(*) as total_count, SUM(amount) as total_amount
-                FROM expenses
-                WHERE user_id = ? AND category != 'Invest'
-            """, (user_id,))
-            expense_alltime = cursor.fetchone()
-
-            # Get all-time invested stats
-            cursor.execute("""
-                SELECT COUNT(*) as total_count, SUM(amount) as total_amount
-                FROM investments
-                WHERE user_id = ?
-            """, (user_id,))
-            invest_alltime = cursor.fetchone()
-            
-            cursor.execute("""
-                SELECT COUNT(*) as total_count, SUM(amount) as total_amount
-                FROM incomes
-                WHERE user_id = ?
-            """, (user_id,))
-            income_alltime = cursor.fetchone()
+            # Get all-time stats for expenses, investments and incomes in one query
+            cursor.execute(ALLTIME_TOTALS_SQL, (user_id,) * 3)
+            alltime = {row['kind']: row for row in cursor}
         
         # Build stats message
-        period = f"{MONTH_NAMES.get(f'{month:02d}', 'Current')} {year}"
+        period = f"{MONTH_NAMES[month]} {year}"
         message = f"📊 **Financial Statistics**\n\n"
         
         # Month summary
@@ -1083,12 +1692,12 @@ async def generate_and_send_stats(update: Update, user_id: int, year_month: str)
         message += f"• Daily (full month): €{avg_daily_expense:.2f}\n\n"
         
         # All-time stats
-        total_expense_alltime = expense_alltime['total_amount'] if expense_alltime['total_amount'] else 0
-        total_invest_alltime = invest_alltime['total_amount'] if invest_alltime['total_amount'] else 0
-        total_income_alltime = income_alltime['total_amount'] if income_alltime['total_amount'] else 0
-        count_expense_alltime = expense_alltime['total_count'] if expense_alltime['total_count'] else 0
-        count_invest_alltime = invest_alltime['total_count'] if invest_alltime['total_count'] else 0
-        count_income_alltime = income_alltime['total_count'] if income_alltime['total_count'] else 0
+        total_expense_alltime = alltime['expenses']['total_amount']
+        total_invest_alltime = alltime['investments']['total_amount']
+        total_income_alltime = alltime['incomes']['total_amount']
+        count_expense_alltime = alltime['expenses']['total_count']
+        count_invest_alltime = alltime['investments']['total_count']
+        count_income_alltime = alltime['incomes']['total_count']
         
         message += f"🌍 **All-Time**:\n"
         message += f"💸 Total expenses: €{total_expense_alltime:.2f} ({count_expense_alltime} entries)\n"
@@ -1109,18 +1718,12 @@ async def expense_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     context.user_data.clear()
     context.user_data["viewing_type"] = "expense"
     
-    keyboard = [
-        ["📅 Today", "📆 Specific Day"],
-        ["📊 Month", "📈 Year"],
-        ["❌ Cancel"]
-    ]
-    
     await update.message.reply_text(
         "💸 **View Expenses**\n\n"
         "Choose the period:\n\n"
         "💡 Use /cancel to stop.",
         parse_mode="Markdown",
-        reply_markup=ReplyKeyboardMarkup(keyboard, one_time_keyboard=True, resize_keyboard=True)
+        reply_markup=PERIOD_KEYBOARD
     )
     return EXPENSE_PERIOD
 
@@ -1130,18 +1733,12 @@ async def invest_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     context.user_data.clear()
     context.user_data["viewing_type"] = "invest"
 
-    keyboard = [
-        ["📅 Today", "📆 Specific Day"],
-        ["📊 Month", "📈 Year"],
-        ["❌ Cancel"]
-    ]
-
     await update.message.reply_text(
         "📈 **View Investments**\n\n"
         "Choose the period:\n\n"
         "💡 Use /cancel to stop.",
         parse_mode="Markdown",
-        reply_markup=ReplyKeyboardMarkup(keyboard, one_time_keyboard=True, resize_keyboard=True)
+        reply_markup=PERIOD_KEYBOARD
     )
     return EXPENSE_PERIOD
 
@@ -1182,17 +1779,9 @@ async def handle_expense_period(update: Update, context: ContextTypes.DEFAULT_TY
             return ConversationHandler.END
         
         # Create keyboard
-        keyboard = []
-        for i in range(0, min(len(available_months), 12), 2):
-            row = [format_month_for_display(available_months[i])]
-            if i + 1 < len(available_months):
-                row.append(format_month_for_display(available_months[i + 1]))
-            keyboard.append(row)
-        keyboard.append(["❌ Cancel"])
+        keyboard = build_month_keyboard(available_months)
         
-        context.user_data['month_mapping'] = {
-            format_month_for_display(m): m for m in available_months
-        }
+        context.user_data['month_mapping'] = get_month_display_mapping(tuple(available_months))
         
         await update.message.reply_text(
             "📆 **Select Month**",
@@ -1212,13 +1801,7 @@ async def handle_expense_period(update: Update, context: ContextTypes.DEFAULT_TY
             )
             return ConversationHandler.END
         
-        keyboard = []
-        for i in range(0, len(available_years), 2):
-            row = [f"📊 {available_years[i]}"]
-            if i + 1 < len(available_years):
-                row.append(f"📊 {available_years[i + 1]}")
-            keyboard.append(row)
-        keyboard.append(["❌ Cancel"])
+        keyboard = build_year_keyboard(available_years)
         
         await update.message.reply_text(
             "📊 **Select Year**",
@@ -1236,8 +1819,7 @@ async def handle_expense_day(update: Update, context: ContextTypes.DEFAULT_TYPE)
     viewing_type = context.user_data.get("viewing_type", "expense")
     
     try:
-        parsed_date = datetime.strptime(date_text, "%d/%m/%y")
-        date_str = parsed_date.strftime("%Y-%m-%d")
+        date_str = parse_short_date(date_text)
     except ValueError:
         await update.message.reply_text(
             "❌ Invalid date format. Use DD/MM/YY\n\n"
@@ -1278,9 +1860,9 @@ async def handle_expense_year(update: Update, context: ContextTypes.DEFAULT_TYPE
         await update.message.reply_text("❌ Cancelled.", reply_markup=ReplyKeyboardRemove())
         return ConversationHandler.END
     
-    year = choice.replace("📊 ", "").strip()
+    year = parse_year_choice(choice)
     
-    if not year.isdigit() or len(year) != 4:
+    if not year:
         await update.message.reply_text("❌ Invalid year.")
         return ConversationHandler.END
     
@@ -1292,18 +1874,12 @@ async def income_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     context.user_data.clear()
     context.user_data["viewing_type"] = "income"
     
-    keyboard = [
-        ["📅 Today", "📆 Specific Day"],
-        ["📊 Month", "📈 Year"],
-        ["❌ Cancel"]
-    ]
-    
     await update.message.reply_text(
         "💵 **View Incomes**\n\n"
         "Choose the period:\n\n"
         "💡 Use /cancel to stop.",
         parse_mode="Markdown",
-        reply_markup=ReplyKeyboardMarkup(keyboard, one_time_keyboard=True, resize_keyboard=True)
+        reply_markup=PERIOD_KEYBOARD
     )
     return EXPENSE_PERIOD
 
@@ -1339,17 +1915,9 @@ async def handle_income_period(update: Update, context: ContextTypes.DEFAULT_TYP
             await update.message.reply_text("📭 No data found.", reply_markup=ReplyKeyboardRemove())
             return ConversationHandler.END
         
-        keyboard = []
-        for i in range(0, min(len(available_months), 12), 2):
-            row = [format_month_for_display(available_months[i])]
-            if i + 1 < len(available_months):
-                row.append(format_month_for_display(available_months[i + 1]))
-            keyboard.append(row)
-        keyboard.append(["❌ Cancel"])
+        keyboard = build_month_keyboard(available_months)
         
-        context.user_data['month_mapping'] = {
-            format_month_for_display(m): m for m in available_months
-        }
+        context.user_data['month_mapping'] = get_month_display_mapping(tuple(available_months))
         
         await update.message.reply_text(
             "📆 **Select Month**",
@@ -1366,13 +1934,7 @@ async def handle_income_period(update: Update, context: ContextTypes.DEFAULT_TYP
             await update.message.reply_text("📭 No data found.", reply_markup=ReplyKeyboardRemove())
             return ConversationHandler.END
         
-        keyboard = []
-        for i in range(0, len(available_years), 2):
-            row = [f"📊 {available_years[i]}"]
-            if i + 1 < len(available_years):
-                row.append(f"📊 {available_years[i + 1]}")
-            keyboard.append(row)
-        keyboard.append(["❌ Cancel"])
+        keyboard = build_year_keyboard(available_years)
         
         await update.message.reply_text(
             "📊 **Select Year**",
@@ -1389,8 +1951,7 @@ async def handle_income_day(update: Update, context: ContextTypes.DEFAULT_TYPE)
     date_text = update.message.text.strip()
     
     try:
-        parsed_date = datetime.strptime(date_text, "%d/%m/%y")
-        date_str = parsed_date.strftime("%Y-%m-%d")
+        date_str = parse_short_date(date_text)
     except ValueError:
         await update.message.reply_text(
             "❌ Invalid date format. Use DD/MM/YY\n\n"
@@ -1429,9 +1990,9 @@ async def handle_income_year(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await update.message.reply_text("❌ Cancelled.", reply_markup=ReplyKeyboardRemove())
         return ConversationHandler.END
     
-    year = choice.replace("📊 ", "").strip()
+    year = parse_year_choice(choice)
     
-    if not year.isdigit() or len(year) != 4:
+    if not year:
         await update.message.reply_text("❌ Invalid year.")
         return ConversationHandler.END
     
@@ -1444,15 +2005,12 @@ async def show_entries_by_period(update: Update, context: ContextTypes.DEFAULT_T
     if entry_type == "income":
         table = "incomes"
         emoji = "💵"
-        query_filter = ""
     elif entry_type == "invest":
         table = "investments"
         emoji = "📈"
-        query_filter = ""
     else:
         table = "expenses"
         emoji = "💸"
-        query_filter = ""
     
     try:
         # Determine date range
@@ -1468,35 +2026,33 @@ async def show_entries_by_period(update: Update, context: ContextTypes.DEFAULT_T
             await update.message.reply_text("❌ Invalid period.", reply_markup=ReplyKeyboardRemove())
             return ConversationHandler.END
         
-        # Get entries
+        # Get total and count in SQL, then the entries themselves (both indexed range scans)
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(f"""
-                SELECT * FROM {table}
-                WHERE user_id = ? AND date >= ? AND date <= ?{query_filter}
-                ORDER BY date DESC, time DESC
-            """, (user_id, start_date, end_date))
-            entries = cursor.fetchall()
+            cursor.row_factory = None
+            cursor.execute(PERIOD_TOTAL_SQL[table], (user_id, start_date, end_date))
+            total, count = cursor.fetchone()
+            
+            # Build message straight from the cursor (no intermediate list of rows)
+            if count:
+                label = "Investments" if entry_type == "invest" else f"{entry_type.capitalize()}s"
+                lines = [f"{emoji} **{label}** ({start_date} to {end_date}):\n"]
+                cursor.execute(PERIOD_LISTING_SQL[table], (user_id, start_date, end_date))
+                lines.extend(
+                    f"• {entry_date} | {category} > {subcategory}: €{amount:.2f}"
+                    for entry_date, category, subcategory, amount in cursor
+                )
+                lines.append(f"\n**Total: €{total:.2f}** ({count} entries)")
         
         # Check if any entries found
-        if not entries:
+        if not count:
             await update.message.reply_text(
                 f"📭 No entries on this day.",
                 reply_markup=ReplyKeyboardRemove()
             )
             return ConversationHandler.END
         
-        # Build message
-        total = sum(row['amount'] for row in entries)
-        label = "Investments" if entry_type == "invest" else f"{entry_type.capitalize()}s"
-        message = f"{emoji} **{label}** ({start_date} to {end_date}):\n\n"
-        
-        for entry in entries:
-            message += f"• {entry['date']} | {entry['category']} > {entry['subcategory']}: €{entry['amount']:.2f}\n"
-        
-        message += f"\n**Total: €{total:.2f}** ({len(entries)} entries)"
-        
-        await update.message.reply_text(message, parse_mode="Markdown", reply_markup=ReplyKeyboardRemove())
+        await update.message.reply_text("\n".join(lines), parse_mode="Markdown", reply_markup=ReplyKeyboardRemove())
         
     except Exception as e:
         await handle_error(update, e, f"showing {entry_type} entries")
@@ -1506,109 +2062,12 @@ async def show_entries_by_period(update: Update, context: ContextTypes.DEFAULT_T
 
 async def categories_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show all available categories and subcategories"""
-    message = "📂 All Categories & Subcategories\n\n"
-    
-    # Expense categories
-    message += "💸 EXPENSES:\n\n"
-    
-    for category in ["Home", "Car", "Lazer", "Travel", "Needs", "Health", "Subscriptions", "Others"]:
-        if category in SUBCATEGORIES:
-            # Category emoji mapping
-            category_emojis = {
-                "Home": "🏠",
-                "Car": "🚗",
-                "Lazer": "🎮",
-                "Travel": "✈️",
-                "Needs": "🛒",
-                "Health": "🏥",
-                "Subscriptions": "📺",
-                "Others": "📦"
-            }
-            
-            emoji = category_emojis.get(category, "📌")
-            message += f"{emoji} {category}\n"
-            
-            # Get subcategories
-            if category == "Subscriptions":
-                message += "   → (Free text input)\n\n"
-            else:
-                subcats = SUBCATEGORIES[category]
-                # Flatten the keyboard structure
-                all_subs = []
-                for row in subcats:
-                    all_subs.extend(row)
-                
-                for sub in all_subs:
-                    message += f"   • {sub}\n"
-                message += "\n"
-    
-    # Income categories
-    message += "💵 INCOMES:\n\n"
-    
-    if "Incomes" in SUBCATEGORIES:
-        subcats = SUBCATEGORIES["Incomes"]
-        all_subs = []
-        for row in subcats:
-            all_subs.extend(row)
-        
-        for sub in all_subs:
-            message += f"   • {sub}\n"
-
-    # Investment categories
-    message += "\n📈 INVEST:\n\n"
-
-    if "Invest" in SUBCATEGORIES:
-        subcats = SUBCATEGORIES["Invest"]
-        all_subs = []
-        for row in subcats:
-            all_subs.extend(row)
-
-        for sub in all_subs:
-            message += f"   • {sub}\n"
-    
-    message += "\n💡 Use /add to create a new entry!"
-    
-    await update.message.reply_text(message)
+    await update.message.reply_text(CATEGORIES_TEXT)
 
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show help message with all available commands"""
-    await update.message.reply_text(
-        "🤖 **Finance Tracker - Help**\n\n"
-        "━━━━━━━━━━━━━━━━━━\n\n"
-        "🔑 **KEY TYPES**\n"
-        "• Expenses\n"
-        "• Invest\n"
-        "• Income\n\n"
-        
-        "✨ **GETTING STARTED**\n"
-        "• /add → Add new expense, income or investment\n"
-        "• /categories → See all categories\n\n"
-        
-        "📊 **VIEW YOUR DATA**\n"
-        "• /expense → View expenses by period\n"
-        "• /invest → View investments by period\n"
-        "• /income → View incomes by period\n"
-        "• /summary → Financial summary\n"
-        "• /stats → Detailed statistics\n\n"
-        
-        "✏️ **MANAGE ENTRIES**\n"
-        "• /edit → Modify an entry (period-based)\n"
-        "• /delete → Remove an entry (period-based)\n"
-        "• /search → Find by category\n"
-        "  _Example: /search groceries_\n\n"
-        
-        "📄 **EXPORT**\n"
-        "• /pdf → Generate PDF report\n\n"
-        
-        "━━━━━━━━━━━━━━━━━━\n\n"
-        "💡 **Tips:**\n"
-        "• Use /cancel anytime to stop\n"
-        "• Commands guide you step-by-step\n"
-        "• All data is saved automatically\n\n"
-
-        "Happy tracking! 📈💰",
-    )
+    await update.message.reply_text(HELP_TEXT)
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -1619,12 +2078,8 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     context.user_data.clear()
 
     await update.message.reply_text(
-        "👋 Welcome to your Expense & Income Tracker! 📊\n\n"
-        "I'll help you track your finances easily.\n\n"
-        "Use /help to see all available commands.\n\n"
-        "Let's add an entry! Please select a type:\n\n"
-        "💡 Use /cancel to stop.",
-        reply_markup=ReplyKeyboardMarkup(ENTRY_TYPE_OPTIONS, one_time_keyboard=True),
+        WELCOME_TEXT,
+        reply_markup=ENTRY_TYPE_KEYBOARD,
     )
     return ADD_TYPE
 
@@ -1639,7 +2094,7 @@ async def add_expense(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
     await update.message.reply_text(
         "Let's add a new entry! 💰\n\n"
         "Please select a type:",
-        reply_markup=ReplyKeyboardMarkup(ENTRY_TYPE_OPTIONS, one_time_keyboard=True),
+        reply_markup=ENTRY_TYPE_KEYBOARD,
     )
     return ADD_TYPE
 
@@ -1651,49 +2106,46 @@ async def handle_add_type(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     if selection_lower in ["expense", "expenses"]:
         context.user_data["entry_type"] = "expense"
-        expense_keyboard = add_emoji_to_keyboard(EXPENSE_CATEGORIES, "💸")
         await update.message.reply_text(
             "💸 **Add Expense**\n\n"
             "Please select an expense category:",
             parse_mode="Markdown",
-            reply_markup=ReplyKeyboardMarkup(expense_keyboard, one_time_keyboard=True),
+            reply_markup=EXPENSE_CATEGORY_KEYBOARD,
         )
         return CATEGORY
 
     if selection_lower in ["income", "incomes"]:
         context.user_data["entry_type"] = "income"
         context.user_data["category"] = "Incomes"
-        income_keyboard = add_emoji_to_keyboard(SUBCATEGORIES["Incomes"], "💵")
         await update.message.reply_text(
             "💵 **Add Income**\n\n"
             "Please select an income category:",
             parse_mode="Markdown",
-            reply_markup=ReplyKeyboardMarkup(income_keyboard, one_time_keyboard=True),
+            reply_markup=INCOME_SUBCATEGORY_KEYBOARD,
         )
         return SUBCATEGORY
 
     if selection_lower in ["invest", "investment", "investments"]:
         context.user_data["entry_type"] = "invest"
         context.user_data["category"] = "Invest"
-        invest_keyboard = add_emoji_to_keyboard(SUBCATEGORIES["Invest"], "📈")
         await update.message.reply_text(
             "📈 **Add Investment**\n\n"
             "Please select an investment category:",
             parse_mode="Markdown",
-            reply_markup=ReplyKeyboardMarkup(invest_keyboard, one_time_keyboard=True),
+            reply_markup=INVEST_SUBCATEGORY_KEYBOARD,
         )
         return SUBCATEGORY
 
     await update.message.reply_text(
         "Please choose Income, Expenses or Invest:",
-        reply_markup=ReplyKeyboardMarkup(ENTRY_TYPE_OPTIONS, one_time_keyboard=True),
+        reply_markup=ENTRY_TYPE_KEYBOARD,
     )
     return ADD_TYPE
 
 
 async def category(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Store category and ask for subcategory"""
-    selected_category = update.message.text.replace("💸 ", "").strip()
+    selected_category = strip_keyboard_emoji(update.message.text)
     context.user_data["category"] = selected_category
 
     if selected_category in TEXT_SUBCATEGORY_CATEGORIES:
@@ -1705,14 +2157,11 @@ async def category(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         return SUBCATEGORY
     
     # Get subcategories for the selected category
-    if selected_category in SUBCATEGORIES:
-        subcats = SUBCATEGORIES[selected_category]
-        emoji = "💸"
-        subcat_keyboard = add_emoji_to_keyboard(subcats, emoji)
+    if selected_category in SUBCATEGORY_KEYBOARDS:
         await update.message.reply_text(
             f"Category: {selected_category}\n\n"
             "Please select a subcategory:",
-            reply_markup=ReplyKeyboardMarkup(subcat_keyboard, one_time_keyboard=True),
+            reply_markup=SUBCATEGORY_KEYBOARDS[selected_category],
         )
         return SUBCATEGORY
     else:
@@ -1727,7 +2176,7 @@ async def category(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
 async def subcategory(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Store subcategory and ask for amount"""
-    selected_subcategory = update.message.text.replace("💸 ", "").replace("💵 ", "").replace("📈 ", "").strip()
+    selected_subcategory = strip_keyboard_emoji(update.message.text)
     category = context.user_data["category"]
     
     # Validate subscription length
@@ -1760,8 +2209,16 @@ async def subcategory(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
 
 async def amount(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Store amount and ask for description (or auto-save if description not needed)"""
+    amount_text = update.message.text.strip()
+    # Reject non-numeric text up front instead of going through float()'s exception path
+    if not AMOUNT_PATTERN.fullmatch(amount_text):
+        await update.message.reply_text(
+            "Please enter a valid number for the amount (use . as decimal separator):"
+        )
+        return AMOUNT
+    
     try:
-        amount_value = float(update.message.text)
+        amount_value = float(amount_text)
         
         # Validate amount
         if not math.isfinite(amount_value):
@@ -1782,19 +2239,20 @@ async def amount(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
             )
             return AMOUNT
         
-        context.user_data["amount"] = amount_value
+        user_data = context.user_data
+        user_data["amount"] = amount_value
         
         # Check if we should skip description
-        if context.user_data.get("skip_description", False):
+        if user_data.get("skip_description", False):
             # Auto-fill description with N/A and save directly
-            category = context.user_data["category"]
-            subcategory = context.user_data.get("subcategory", "N/A")
+            category = user_data["category"]
+            subcategory = user_data.get("subcategory", "N/A")
             description = "N/A"
-            target_date = context.user_data.get("target_date")
+            target_date = user_data.get("target_date")
             user_id = update.effective_user.id
             
             is_income = (category == "Incomes")
-            if save_expense(category, subcategory, amount_value, description, user_id, target_date):
+            if await save_expense(category, subcategory, amount_value, description, user_id, target_date):
                 await update.message.reply_text(
                     format_success_message(category, subcategory, amount_value, description, target_date, is_income)
                 )
@@ -1803,7 +2261,7 @@ async def amount(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
                     "❌ Sorry, there was an error saving your entry. Please try again."
                 )
             
-            context.user_data.clear()
+            user_data.clear()
             return ConversationHandler.END
         else:
             # Ask for description as usual
@@ -1831,17 +2289,16 @@ async def description(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
             f"New description: {description_text}"
         )
     
-    context.user_data["description"] = description_text
-    
-    category = context.user_data["category"]
-    subcategory = context.user_data.get("subcategory", "N/A")
-    amount = context.user_data["amount"]
+    user_data = context.user_data
+    category = user_data["category"]
+    subcategory = user_data.get("subcategory", "N/A")
+    amount = user_data["amount"]
     description = description_text
-    target_date = context.user_data.get("target_date")
+    target_date = user_data.get("target_date")
     user_id = update.effective_user.id
     is_income = (category == "Incomes")
     
-    if save_expense(category, subcategory, amount, description, user_id, target_date):
+    if await save_expense(category, subcategory, amount, description, user_id, target_date):
         await update.message.reply_text(
             format_success_message(category, subcategory, amount, description, target_date, is_income)
         )
@@ -1850,7 +2307,7 @@ async def description(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
             "❌ Sorry, there was an error saving your entry. Please try again."
         )
     
-    context.user_data.clear()
+    user_data.clear()
     return ConversationHandler.END
 
 
@@ -1859,18 +2316,12 @@ async def summary_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     # Clear any previous conversation state
     context.user_data.clear()
     
-    keyboard = [
-        ["📅 Today", "📆 Specific Day"],
-        ["📊 Month", "📈 Year"],
-        ["❌ Cancel"]
-    ]
-    
     await update.message.reply_text(
         "📊 *Financial Summary*\n\n"
         "Choose the period you want to view:\n\n"
         "💡 Use /cancel to stop.",
         parse_mode="Markdown",
-        reply_markup=ReplyKeyboardMarkup(keyboard, one_time_keyboard=True, resize_keyboard=True)
+        reply_markup=PERIOD_KEYBOARD
     )
     return SUMMARY_PERIOD
 
@@ -1914,18 +2365,10 @@ async def handle_summary_period(update: Update, context: ContextTypes.DEFAULT_TY
             return ConversationHandler.END
         
         # Create keyboard with available months (max 12 for display)
-        keyboard = []
-        for i in range(0, min(len(available_months), 12), 2):
-            row = [format_month_for_display(available_months[i])]
-            if i + 1 < len(available_months):
-                row.append(format_month_for_display(available_months[i + 1]))
-            keyboard.append(row)
-        keyboard.append(["❌ Cancel"])
+        keyboard = build_month_keyboard(available_months)
         
         # Store mapping for later use
-        context.user_data['summary_month_mapping'] = {
-            format_month_for_display(m): m for m in available_months
-        }
+        context.user_data['summary_month_mapping'] = get_month_display_mapping(tuple(available_months))
         
         await update.message.reply_text(
             "📆 *Select Month*\n\n"
@@ -1947,13 +2390,7 @@ async def handle_summary_period(update: Update, context: ContextTypes.DEFAULT_TY
             return ConversationHandler.END
         
         # Create keyboard with available years
-        keyboard = []
-        for i in range(0, len(available_years), 2):
-            row = [f"📊 {available_years[i]}"]
-            if i + 1 < len(available_years):
-                row.append(f"📊 {available_years[i + 1]}")
-            keyboard.append(row)
-        keyboard.append(["❌ Cancel"])
+        keyboard = build_year_keyboard(available_years)
         
         await update.message.reply_text(
             "📊 *Select Year*\n\n"
@@ -1975,19 +2412,24 @@ async def handle_summary_day(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     # Parse date in various formats
     target_date = None
-    current_year = datetime.now().year
+    current_year = get_current_year()
     
     try:
+        # Plain string checks are enough for these fixed formats (no regex needed)
+        parts = date_input.split('/')
+        has_day_month = len(parts) in (2, 3) and all(len(part) <= 2 and part.isdigit() for part in parts[:2])
+        
         # Try DD/MM format (current year)
-        if re.match(r'^\d{1,2}/\d{1,2}$', date_input):
-            day, month = date_input.split('/')
+        if has_day_month and len(parts) == 2:
+            day, month = parts
             target_date = f"{current_year}-{int(month):02d}-{int(day):02d}"
         # Try DD/MM/YYYY format
-        elif re.match(r'^\d{1,2}/\d{1,2}/\d{4}$', date_input):
-            day, month, year = date_input.split('/')
+        elif has_day_month and len(parts[2]) == 4 and parts[2].isdigit():
+            day, month, year = parts
             target_date = f"{year}-{int(month):02d}-{int(day):02d}"
         # Try YYYY-MM-DD format
-        elif re.match(r'^\d{4}-\d{2}-\d{2}$', date_input):
+        elif (len(date_input) == 10 and date_input[4] == '-' and date_input[7] == '-'
+              and (date_input[:4] + date_input[5:7] + date_input[8:]).isdigit()):
             target_date = date_input
         else:
             await update.message.reply_text(
@@ -1998,8 +2440,8 @@ async def handle_summary_day(update: Update, context: ContextTypes.DEFAULT_TYPE)
             )
             return SUMMARY_DAY
         
-        # Validate date exists
-        datetime.strptime(target_date, "%Y-%m-%d")
+        # Validate date exists (target_date is always YYYY-MM-DD here)
+        date.fromisoformat(target_date)
         
     except ValueError:
         await update.message.reply_text(
@@ -2043,9 +2485,9 @@ async def handle_summary_year(update: Update, context: ContextTypes.DEFAULT_TYPE
         return ConversationHandler.END
     
     # Extract year from choice (e.g., "📊 2026" -> "2026")
-    year = choice.replace("📊 ", "").strip()
+    year = parse_year_choice(choice)
     
-    if not year.isdigit() or len(year) != 4:
+    if not year:
         await update.message.reply_text("❌ Invalid year. Please try again with /summary")
         return ConversationHandler.END
     
@@ -2072,39 +2514,33 @@ async def generate_and_send_summary(update: Update, user_id: int, period_type: s
             await update.message.reply_text("❌ Invalid period type.", reply_markup=ReplyKeyboardRemove())
             return ConversationHandler.END
         
-        # Get expenses grouped by category
+        # Get expenses, investments and incomes grouped by category in a single round trip
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            # Plain tuples, unpacked positionally below
+            cursor.row_factory = None
+            params = (user_id, start_date, end_date) * 3
             
-            # Expenses by category
-            cursor.execute("""
-                SELECT category, subcategory, SUM(amount) as total, COUNT(*) as count
-                FROM expenses
-                WHERE user_id = ? AND date >= ? AND date <= ? AND category != 'Invest'
-                GROUP BY category, subcategory
-                ORDER BY category, subcategory
-            """, (user_id, start_date, end_date))
-            expense_totals = cursor.fetchall()
-
-            # Investments by category
-            cursor.execute("""
-                SELECT category, subcategory, SUM(amount) as total, COUNT(*) as count
-                FROM investments
-                WHERE user_id = ? AND date >= ? AND date <= ?
-                GROUP BY category, subcategory
-                ORDER BY category, subcategory
-            """, (user_id, start_date, end_date))
-            invest_totals = cursor.fetchall()
+            # Probe for any entry first so empty periods skip the grouping work
+            cursor.execute(PERIOD_HAS_ENTRIES_SQL, params)
+            has_entries = cursor.fetchone()[0]
             
-            # Incomes by category
-            cursor.execute("""
-                SELECT category, subcategory, SUM(amount) as total, COUNT(*) as count
-                FROM incomes
-                WHERE user_id = ? AND date >= ? AND date <= ?
-                GROUP BY category, subcategory
-                ORDER BY category, subcategory
-            """, (user_id, start_date, end_date))
-            income_totals = cursor.fetchall()
+            totals_by_kind = {"expense": [], "invest": [], "income": []}
+            grand_totals = {"expense": (0.0, 0), "invest": (0.0, 0), "income": (0.0, 0)}
+            if has_entries:
+                cursor.execute(SUMMARY_TOTALS_SQL, params * 2)
+                for kind, category, subcategory, total, count in cursor:
+                    if category is None:
+                        grand_totals[kind] = (total, count)
+                    else:
+                        totals_by_kind[kind].append((category, subcategory, total, count))
+        
+        expense_totals = totals_by_kind["expense"]
+        invest_totals = totals_by_kind["invest"]
+        income_totals = totals_by_kind["income"]
+        expense_grand_total, expense_count = grand_totals["expense"]
+        invested_grand_total, invest_count = grand_totals["invest"]
+        income_grand_total, income_count = grand_totals["income"]
         
         # Check if there's any data
         if not expense_totals and not income_totals and not invest_totals:
@@ -2115,66 +2551,45 @@ async def generate_and_send_summary(update: Update, user_id: int, period_type: s
             return ConversationHandler.END
         
         # Build message
-        message = f"📊 *Summary for {period_name}*\n\n"
+        parts = [f"📊 *Summary for {period_name}*\n\n"]
         
         # Expenses section
         if expense_totals:
-            expense_grand_total = 0.0
-            expense_count = 0
-            message += "💸 *Expenses:*\n"
-            for row in expense_totals:
-                cat_key = f"{row['category']} > {row['subcategory']}"
-                total = row['total']
-                count = row['count']
-                expense_grand_total += total
-                expense_count += count
-                message += f"  • {cat_key}: €{total:.2f} ({count})\n"
-            message += f"  📝 *Total:* €{expense_grand_total:.2f} ({expense_count} entries)\n\n"
+            parts.append("💸 *Expenses:*\n")
+            for category, subcategory, total, count in expense_totals:
+                cat_key = f"{category} > {subcategory}"
+                parts.append(f"  • {cat_key}: €{total:.2f} ({count})\n")
+            parts.append(f"  📝 *Total:* €{expense_grand_total:.2f} ({expense_count} entries)\n\n")
         else:
-            expense_grand_total = 0.0
-            message += "💸 *Expenses:* €0.00\n\n"
+            parts.append("💸 *Expenses:* €0.00\n\n")
         
         # Incomes section
         if income_totals:
-            income_grand_total = 0.0
-            income_count = 0
-            message += "💵 *Incomes:*\n"
-            for row in income_totals:
-                cat_key = f"{row['category']} > {row['subcategory']}"
-                total = row['total']
-                count = row['count']
-                income_grand_total += total
-                income_count += count
-                message += f"  • {cat_key}: €{total:.2f} ({count})\n"
-            message += f"  📝 *Total:* €{income_grand_total:.2f} ({income_count} entries)\n\n"
+            parts.append("💵 *Incomes:*\n")
+            for category, subcategory, total, count in income_totals:
+                cat_key = f"{category} > {subcategory}"
+                parts.append(f"  • {cat_key}: €{total:.2f} ({count})\n")
+            parts.append(f"  📝 *Total:* €{income_grand_total:.2f} ({income_count} entries)\n\n")
         else:
-            income_grand_total = 0.0
-            message += "💵 *Incomes:* €0.00\n\n"
+            parts.append("💵 *Incomes:* €0.00\n\n")
 
         # Investments section (separate from expenses)
         if invest_totals:
-            invested_grand_total = 0.0
-            invest_count = 0
-            message += "📈 *Investido:*\n"
-            for row in invest_totals:
-                cat_key = f"{row['category']} > {row['subcategory']}"
-                total = row['total']
-                count = row['count']
-                invested_grand_total += total
-                invest_count += count
-                message += f"  • {cat_key}: €{total:.2f} ({count})\n"
-            message += f"  📝 *Total Investido:* €{invested_grand_total:.2f} ({invest_count} entries)\n\n"
+            parts.append("📈 *Investido:*\n")
+            for category, subcategory, total, count in invest_totals:
+                cat_key = f"{category} > {subcategory}"
+                parts.append(f"  • {cat_key}: €{total:.2f} ({count})\n")
+            parts.append(f"  📝 *Total Investido:* €{invested_grand_total:.2f} ({invest_count} entries)\n\n")
         else:
-            invested_grand_total = 0.0
-            message += "📈 *Investido:* €0.00\n\n"
+            parts.append("📈 *Investido:* €0.00\n\n")
         
         # Balance
         balance = income_grand_total - expense_grand_total
         balance_emoji = "📈" if balance >= 0 else "📉"
         balance_text = f"+€{balance:.2f}" if balance >= 0 else f"-€{abs(balance):.2f}"
-        message += f"{balance_emoji} *Balance:* {balance_text}"
+        parts.append(f"{balance_emoji} *Balance:* {balance_text}")
         
-        await update.message.reply_text(message, parse_mode="Markdown", reply_markup=ReplyKeyboardRemove())
+        await update.message.reply_text("".join(parts), parse_mode="Markdown", reply_markup=ReplyKeyboardRemove())
         
     except Exception as e:
         logger.error(f"Error generating summary: {e}")
@@ -2201,15 +2616,14 @@ async def show_expenses_for_action(
         
         # Build message with appropriate emoji
         emoji = {"delete": "🗑️", "edit": "✏️"}.get(action, "📋")
-        message = f"{emoji} Expenses for {target_date}:\n\n"
-        
-        for i, row in enumerate(expenses, start=1):
-            message += format_expense_numbered(i, row) + "\n"
-        
-        message += f"\nReply with the number (1-{len(expenses)}) to {action}, or /cancel to abort."
+        lines = [f"{emoji} Expenses for {target_date}:\n"]
+        lines.extend(format_expense_numbered(i, row) for i, row in enumerate(expenses, start=1))
+        if len(expenses) == LISTING_MAX_ENTRIES:
+            lines.append(LISTING_LIMIT_HINT)
+        lines.append(f"\nReply with the number (1-{len(expenses)}) to {action}, or /cancel to abort.")
         
         context.user_data[user_data_key] = expenses
-        await update.message.reply_text(message)
+        await update.message.reply_text("\n".join(lines))
         
     except Exception as e:
         await handle_error(update, e, f"showing expenses for {action}")
@@ -2253,27 +2667,31 @@ async def handle_edit_or_delete_type(update: Update, context: ContextTypes.DEFAU
         )
         return
     
-    # Store table info for later operations
-    context.user_data["target_table"] = table
-    context.user_data["entry_type"] = entry_type
-    
     # Build message with appropriate emoji
     emoji = "🗑️" if is_delete else "✏️"
-    message = f"{emoji} {entry_type}s for {today}:\n\n"
-    
-    for i, row in enumerate(entries, start=1):
-        message += format_expense_numbered(i, row) + "\n"
-    
-    message += f"\nReply with the number (1-{len(entries)}) to {action}, or /cancel to abort."
+    lines = [f"{emoji} {entry_type}s for {today}:\n"]
+    lines.extend(format_expense_numbered(i, row) for i, row in enumerate(entries, start=1))
+    if len(entries) == LISTING_MAX_ENTRIES:
+        lines.append(LISTING_LIMIT_HINT)
+    lines.append(f"\nReply with the number (1-{len(entries)}) to {action}, or /cancel to abort.")
     
     context.user_data[data_key] = entries
-    await update.message.reply_text(message, reply_markup=ReplyKeyboardRemove())
+    await update.message.reply_text("\n".join(lines), reply_markup=ReplyKeyboardRemove())
 
 
-async def handle_delete_number(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle the deletion of an entry (expense or income) by number"""
+async def handle_delete_number(update: Update, context: ContextTypes.DEFAULT_TYPE, choice: int = None):
+    """Handle the deletion of an entry (expense or income) by number, optionally already parsed by the caller"""
+    if choice is None:
+        # Reject non-numeric input up front (no exception path, and the listing stays available)
+        text = update.message.text.strip()
+        if not (text.isascii() and text.isdigit()):
+            await update.message.reply_text(
+                "Please enter a valid number, or /cancel to abort."
+            )
+            return DELETE_NUMBER
+        choice = int(text)
+    
     try:
-        choice = int(update.message.text)
         entries = context.user_data.get("delete_entries", [])
         
         if not entries or choice < 1 or choice > len(entries):
@@ -2287,23 +2705,24 @@ async def handle_delete_number(update: Update, context: ContextTypes.DEFAULT_TYP
         entry_id = row['id']
         user_id = update.effective_user.id
         
-        # Determine table based on whether 'category' is 'Incomes'
-        is_income = row['category'] == 'Incomes'
-        table = "incomes" if is_income else "expenses"
-        entry_type = "Income" if is_income else "Expense"
+        # Determine table from the entry's category
+        table = get_entry_table(row['category'])
+        entry_type = ENTRY_TYPE_NAMES[table]
         
-        # Delete from database (with user_id check for security)
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"DELETE FROM {table} WHERE id = ? AND user_id = ?", (entry_id, user_id))
+        # Delete on the writer thread (with user_id check for security)
+        deleted = await queue_db_write(delete_entry, table, entry_id, user_id)
+        if deleted is None:
+            await update.message.reply_text(
+                f"❌ {entry_type} not found. It may have been deleted already.",
+                reply_markup=ReplyKeyboardRemove()
+            )
+            return ConversationHandler.END
+        bump_user_data_version(user_id)
         
-        # Show confirmation
+        # Show confirmation from the row the DELETE returned
         await update.message.reply_text(
             f"✅ Deleted {entry_type.lower()}:\n\n"
-            f"📋 Category: {row['category']}\n"
-            f"🏷️ Subcategory: {row['subcategory']}\n"
-            f"💵 Amount: €{row['amount']:.2f}\n"
-            f"📝 Description: {row['description']}\n\n"
+            f"{ENTRY_CARD.format_map(deleted)}\n\n"
             f"{entry_type} has been removed.",
             reply_markup=ReplyKeyboardRemove()
         )
@@ -2324,8 +2743,6 @@ async def handle_delete_number(update: Update, context: ContextTypes.DEFAULT_TYP
         context.user_data.pop("period_type", None)
         context.user_data.pop("period_value", None)
         context.user_data.pop("delete_entries", None)
-        context.user_data.pop("target_table", None)
-        context.user_data.pop("entry_type", None)
         context.user_data.pop("delete_action", None)
 
 
@@ -2334,18 +2751,12 @@ async def delete_expense(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     context.user_data.clear()
     context.user_data["delete_action"] = "delete"
     
-    keyboard = [
-        ["📅 Today", "📆 Specific Day"],
-        ["📊 Month", "📈 Year"],
-        ["❌ Cancel"]
-    ]
-    
     await update.message.reply_text(
         "🗑️ **Delete Entry**\n\n"
         "Choose the period:\n\n"
         "💡 Use /cancel to stop.",
         parse_mode="Markdown",
-        reply_markup=ReplyKeyboardMarkup(keyboard, one_time_keyboard=True, resize_keyboard=True)
+        reply_markup=PERIOD_KEYBOARD
     )
     return DELETE_PERIOD
 
@@ -2375,17 +2786,9 @@ async def handle_delete_period(update: Update, context: ContextTypes.DEFAULT_TYP
             await update.message.reply_text("📭 No data found.", reply_markup=ReplyKeyboardRemove())
             return ConversationHandler.END
         
-        keyboard = []
-        for i in range(0, min(len(available_months), 12), 2):
-            row = [format_month_for_display(available_months[i])]
-            if i + 1 < len(available_months):
-                row.append(format_month_for_display(available_months[i + 1]))
-            keyboard.append(row)
-        keyboard.append(["❌ Cancel"])
+        keyboard = build_month_keyboard(available_months)
         
-        context.user_data['month_mapping'] = {
-            format_month_for_display(m): m for m in available_months
-        }
+        context.user_data['month_mapping'] = get_month_display_mapping(tuple(available_months))
         
         await update.message.reply_text(
             "📆 **Select Month**",
@@ -2399,13 +2802,7 @@ async def handle_delete_period(update: Update, context: ContextTypes.DEFAULT_TYP
             await update.message.reply_text("📭 No data found.", reply_markup=ReplyKeyboardRemove())
             return ConversationHandler.END
         
-        keyboard = []
-        for i in range(0, len(available_years), 2):
-            row = [f"📊 {available_years[i]}"]
-            if i + 1 < len(available_years):
-                row.append(f"📊 {available_years[i + 1]}")
-            keyboard.append(row)
-        keyboard.append(["❌ Cancel"])
+        keyboard = build_year_keyboard(available_years)
         
         await update.message.reply_text(
             "📊 **Select Year**",
@@ -2422,8 +2819,7 @@ async def handle_delete_day(update: Update, context: ContextTypes.DEFAULT_TYPE)
     date_text = update.message.text.strip()
     
     try:
-        parsed_date = datetime.strptime(date_text, "%d/%m/%y")
-        date_str = parsed_date.strftime("%Y-%m-%d")
+        date_str = parse_short_date(date_text)
     except ValueError:
         await update.message.reply_text(
             "❌ Invalid date format. Use DD/MM/YY\n\n"
@@ -2463,9 +2859,9 @@ async def handle_delete_year(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await update.message.reply_text("❌ Cancelled.", reply_markup=ReplyKeyboardRemove())
         return ConversationHandler.END
     
-    year = choice.replace("📊 ", "").strip()
+    year = parse_year_choice(choice)
     
-    if not year.isdigit() or len(year) != 4:
+    if not year:
         await update.message.reply_text("❌ Invalid year.")
         return ConversationHandler.END
     
@@ -2489,22 +2885,8 @@ async def show_delete_entries(update: Update, context: ContextTypes.DEFAULT_TYPE
         await update.message.reply_text("❌ Invalid period.", reply_markup=ReplyKeyboardRemove())
         return ConversationHandler.END
     
-    # Get expenses and incomes
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM expenses
-            WHERE user_id = ? AND date >= ? AND date <= ?
-            ORDER BY date DESC, time DESC
-        """, (user_id, start_date, end_date))
-        expenses = cursor.fetchall()
-        
-        cursor.execute("""
-            SELECT * FROM incomes
-            WHERE user_id = ? AND date >= ? AND date <= ?
-            ORDER BY date DESC, time DESC
-        """, (user_id, start_date, end_date))
-        incomes = cursor.fetchall()
+    # Get expenses and incomes off the event loop
+    expenses, incomes = await asyncio.to_thread(get_listing_entries, user_id, start_date, end_date)
     
     if not expenses and not incomes:
         await update.message.reply_text(
@@ -2519,20 +2901,14 @@ async def show_delete_entries(update: Update, context: ContextTypes.DEFAULT_TYPE
     context.user_data["period_value"] = period_value
     
     # Show entries
-    message = f"🗑️ **Delete Entry ({start_date} to {end_date})**:\n\n"
-    
-    idx = 1
-    for exp in expenses:
-        message += f"{idx}. 💸 {exp['date']} | {exp['category']} > {exp['subcategory']}: €{exp['amount']:.2f}\n"
-        idx += 1
+    lines = [f"🗑️ **Delete Entry ({start_date} to {end_date})**:\n"]
+    lines.extend(format_period_entry_numbered(i, "💸", exp) for i, exp in enumerate(expenses, start=1))
+    lines.extend(format_period_entry_numbered(i, "💵", inc) for i, inc in enumerate(incomes, start=len(expenses) + 1))
+    if LISTING_MAX_ENTRIES in (len(expenses), len(incomes)):
+        lines.append(LISTING_LIMIT_HINT)
+    lines.append(f"\nSelect number to delete (1-{len(context.user_data['delete_entries'])}) or /cancel")
     
-    for inc in incomes:
-        message += f"{idx}. 💵 {inc['date']} | {inc['category']} > {inc['subcategory']}: €{inc['amount']:.2f}\n"
-        idx += 1
-    
-    message += f"\nSelect number to delete (1-{len(context.user_data['delete_entries'])}) or /cancel"
-    
-    await update.message.reply_text(message, parse_mode="Markdown", reply_markup=ReplyKeyboardRemove())
+    await update.message.reply_text("\n".join(lines), parse_mode="Markdown", reply_markup=ReplyKeyboardRemove())
     
     return DELETE_NUMBER
 
@@ -2542,18 +2918,12 @@ async def edit_expense(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
     context.user_data.clear()
     context.user_data["edit_action"] = "edit"
     
-    keyboard = [
-        ["📅 Today", "📆 Specific Day"],
-        ["📊 Month", "📈 Year"],
-        ["❌ Cancel"]
-    ]
-    
     await update.message.reply_text(
         "✏️ **Edit Entry**\n\n"
         "Choose the period:\n\n"
         "💡 Use /cancel to stop.",
         parse_mode="Markdown",
-        reply_markup=ReplyKeyboardMarkup(keyboard, one_time_keyboard=True, resize_keyboard=True)
+        reply_markup=PERIOD_KEYBOARD
     )
     return EDIT_PERIOD
 
@@ -2583,17 +2953,9 @@ async def handle_edit_period(update: Update, context: ContextTypes.DEFAULT_TYPE)
             await update.message.reply_text("📭 No data found.", reply_markup=ReplyKeyboardRemove())
             return ConversationHandler.END
         
-        keyboard = []
-        for i in range(0, min(len(available_months), 12), 2):
-            row = [format_month_for_display(available_months[i])]
-            if i + 1 < len(available_months):
-                row.append(format_month_for_display(available_months[i + 1]))
-            keyboard.append(row)
-        keyboard.append(["❌ Cancel"])
+        keyboard = build_month_keyboard(available_months)
         
-        context.user_data['month_mapping'] = {
-            format_month_for_display(m): m for m in available_months
-        }
+        context.user_data['month_mapping'] = get_month_display_mapping(tuple(available_months))
         
         await update.message.reply_text(
             "📆 **Select Month**",
@@ -2607,13 +2969,7 @@ async def handle_edit_period(update: Update, context: ContextTypes.DEFAULT_TYPE)
             await update.message.reply_text("📭 No data found.", reply_markup=ReplyKeyboardRemove())
             return ConversationHandler.END
         
-        keyboard = []
-        for i in range(0, len(available_years), 2):
-            row = [f"📊 {available_years[i]}"]
-            if i + 1 < len(available_years):
-                row.append(f"📊 {available_years[i + 1]}")
-            keyboard.append(row)
-        keyboard.append(["❌ Cancel"])
+        keyboard = build_year_keyboard(available_years)
         
         await update.message.reply_text(
             "📊 **Select Year**",
@@ -2630,8 +2986,7 @@ async def handle_edit_day(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     date_text = update.message.text.strip()
     
     try:
-        parsed_date = datetime.strptime(date_text, "%d/%m/%y")
-        date_str = parsed_date.strftime("%Y-%m-%d")
+        date_str = parse_short_date(date_text)
     except ValueError:
         await update.message.reply_text(
             "❌ Invalid date format. Use DD/MM/YY\n\n"
@@ -2671,9 +3026,9 @@ async def handle_edit_year(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         await update.message.reply_text("❌ Cancelled.", reply_markup=ReplyKeyboardRemove())
         return ConversationHandler.END
     
-    year = choice.replace("📊 ", "").strip()
+    year = parse_year_choice(choice)
     
-    if not year.isdigit() or len(year) != 4:
+    if not year:
         await update.message.reply_text("❌ Invalid year.")
         return ConversationHandler.END
     
@@ -2697,22 +3052,8 @@ async def show_edit_entries(update: Update, context: ContextTypes.DEFAULT_TYPE,
         await update.message.reply_text("❌ Invalid period.", reply_markup=ReplyKeyboardRemove())
         return ConversationHandler.END
     
-    # Get expenses and incomes
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM expenses
-            WHERE user_id = ? AND date >= ? AND date <= ?
-            ORDER BY date DESC, time DESC
-        """, (user_id, start_date, end_date))
-        expenses = cursor.fetchall()
-        
-        cursor.execute("""
-            SELECT * FROM incomes
-            WHERE user_id = ? AND date >= ? AND date <= ?
-            ORDER BY date DESC, time DESC
-        """, (user_id, start_date, end_date))
-        incomes = cursor.fetchall()
+    # Get expenses and incomes off the event loop
+    expenses, incomes = await asyncio.to_thread(get_listing_entries, user_id, start_date, end_date)
     
     if not expenses and not incomes:
         await update.message.reply_text(
@@ -2727,31 +3068,24 @@ async def show_edit_entries(update: Update, context: ContextTypes.DEFAULT_TYPE,
     context.user_data["period_value"] = period_value
     
     # Show entries
-    message = f"✏️ **Entries ({start_date} to {end_date})**:\n\n"
-    
-    idx = 1
-    for exp in expenses:
-        message += f"{idx}. 💸 {exp['date']} | {exp['category']} > {exp['subcategory']}: €{exp['amount']:.2f}\n"
-        idx += 1
+    lines = [f"✏️ **Entries ({start_date} to {end_date})**:\n"]
+    lines.extend(format_period_entry_numbered(i, "💸", exp) for i, exp in enumerate(expenses, start=1))
+    lines.extend(format_period_entry_numbered(i, "💵", inc) for i, inc in enumerate(incomes, start=len(expenses) + 1))
+    if LISTING_MAX_ENTRIES in (len(expenses), len(incomes)):
+        lines.append(LISTING_LIMIT_HINT)
+    lines.append(f"\nSelect number to edit (1-{len(context.user_data['edit_entries'])}) or /cancel")
     
-    for inc in incomes:
-        message += f"{idx}. 💵 {inc['date']} | {inc['category']} > {inc['subcategory']}: €{inc['amount']:.2f}\n"
-        idx += 1
-    
-    message += f"\nSelect number to edit (1-{len(context.user_data['edit_entries'])}) or /cancel"
-    
-    await update.message.reply_text(message, parse_mode="Markdown", reply_markup=ReplyKeyboardRemove())
+    await update.message.reply_text("\n".join(lines), parse_mode="Markdown", reply_markup=ReplyKeyboardRemove())
     
     return EDIT_NUMBER
 
 
-async def handle_edit_number(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle the selection of an entry (expense or income) to edit"""
+async def handle_edit_number(update: Update, context: ContextTypes.DEFAULT_TYPE, choice: int = None):
+    """Handle the selection of an entry (expense or income) to edit, optionally already parsed by the caller"""
     try:
-        choice = int(update.message.text)
+        if choice is None:
+            choice = int(update.message.text)
         entries = context.user_data.get("edit_entries", [])
-        table = context.user_data.get("target_table", "expenses")
-        entry_type = context.user_data.get("entry_type", "Expense")
         
         if not entries or choice < 1 or choice > len(entries):
             await update.message.reply_text(
@@ -2759,8 +3093,10 @@ async def handle_edit_number(update: Update, context: ContextTypes.DEFAULT_TYPE)
             )
             return
         
-        # Store the selected entry for editing
+        # Store the selected entry for editing (listings can mix expenses and incomes)
         row = entries[choice - 1]
+        table = get_entry_table(row['category'])
+        entry_type = ENTRY_TYPE_NAMES[table]
         context.user_data["edit_entry_id"] = row['id']
         context.user_data["edit_entry_table"] = table
         context.user_data["edit_entry_type"] = entry_type
@@ -2775,10 +3111,7 @@ async def handle_edit_number(update: Update, context: ContextTypes.DEFAULT_TYPE)
         # Show what can be edited
         await update.message.reply_text(
             f"✏️ Editing {entry_type.lower()}:\n\n"
-            f"📋 Category: {row['category']}\n"
-            f"🏷️ Subcategory: {row['subcategory']}\n"
-            f"💵 Amount: €{row['amount']:.2f}\n"
-            f"📝 Description: {row['description']}\n\n"
+            f"{ENTRY_CARD.format_map(row)}\n\n"
             "What would you like to edit?\n"
             "Reply with:\n"
             "• 'amount' - Change the amount\n"
@@ -2846,6 +3179,12 @@ async def handle_edit_value(update: Update, context: ContextTypes.DEFAULT_TYPE):
         new_value = update.message.text
         
         if field == "amount":
+            new_value = new_value.strip()
+            if not AMOUNT_PATTERN.fullmatch(new_value):
+                await update.message.reply_text(
+                    "Please enter a valid number for the amount, or /cancel to abort."
+                )
+                return EDIT_VALUE
             new_value = float(new_value)
             
             # Validate amount
@@ -2873,31 +3212,20 @@ async def handle_edit_value(update: Update, context: ContextTypes.DEFAULT_TYPE):
         entry_type = context.user_data["edit_entry_type"]
         user_id = update.effective_user.id
         
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            if field == "amount":
-                cursor.execute(
-                    f"UPDATE {table} SET amount = ? WHERE id = ? AND user_id = ?",
-                    (new_value, entry_id, user_id)
-                )
-                context.user_data["edit_entry_data"]["amount"] = new_value
-            elif field == "description":
-                cursor.execute(
-                    f"UPDATE {table} SET description = ? WHERE id = ? AND user_id = ?",
-                    (new_value, entry_id, user_id)
-                )
-                context.user_data["edit_entry_data"]["description"] = new_value
+        data = await queue_db_write(update_entry_field, table, field, new_value, entry_id, user_id)
         
-        # Show confirmation
-        data = context.user_data["edit_entry_data"]
-        await update.message.reply_text(
-            f"✅ {entry_type} updated successfully!\n\n"
-            f"📋 Category: {data['category']}\n"
-            f"🏷️ Subcategory: {data['subcategory']}\n"
-            f"💵 Amount: €{data['amount']:.2f}\n"
-            f"📝 Description: {data['description']}"
-        )
+        # Show confirmation from the row the UPDATE returned
+        if data is None:
+            await update.message.reply_text(
+                f"❌ {entry_type} not found. It may have been deleted in the meantime.",
+                reply_markup=ReplyKeyboardRemove()
+            )
+        else:
+            bump_user_data_version(user_id)
+            await update.message.reply_text(
+                f"✅ {entry_type} updated successfully!\n\n"
+                f"{ENTRY_CARD.format_map(data)}"
+            )
         
         # Clean up
         context.user_data.pop("edit_entries", None)
@@ -2968,8 +3296,17 @@ def main():
         logger.error(f"FATAL: Failed to initialize database: {e}")
         sys.exit(1)
     
+    # Start with an empty PDF cache (disabled if it can't be cleared)
+    init_pdf_cache()
+    
     # Create application
-    application = Application.builder().token(BOT_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .post_init(start_write_queue)
+        .post_shutdown(stop_write_queue)
+        .build()
+    )
     
     # Add conversation handler for adding expenses (today or specific date)
     conv_handler = ConversationHandler(
@@ -3016,7 +3353,8 @@ def main():
     application.add_handler(conv_handler)
     application.add_handler(pdf_handler)
     application.add_handler(summary_handler)
-    application.add_handler(CommandHandler("search", search_command))
+    # Stateless commands don't block the update queue while they wait on Telegram
+    application.add_handler(CommandHandler("search", search_command, block=False))
     
     # Conversation handler for stats with month selection
     stats_handler = ConversationHandler(
@@ -3102,32 +3440,41 @@ def main():
     
     # Combined handler for all non-conversation text input
     async def handle_text_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        user_data = context.user_data
+        # Most plain messages arrive with no pending edit/delete state
+        if not user_data:
+            return
         text = update.message.text.strip()
         
         # Priority 1: Choosing between expenses/incomes for delete or edit
-        if context.user_data.get("delete_action") or context.user_data.get("edit_action"):
+        if user_data.get("delete_action") or user_data.get("edit_action"):
             if "Expenses" in text or "Incomes" in text or "Cancel" in text:
                 await handle_edit_or_delete_type(update, context)
                 return
         
         # Priority 2: Editing field value
-        if context.user_data.get("editing_field"):
+        if user_data.get("editing_field"):
             await handle_edit_value(update, context)
             return
         
         # Priority 3: Selecting what field to edit
-        if context.user_data.get("edit_entry_data") and text.lower() in ["amount", "description"]:
+        if user_data.get("edit_entry_data") and text.lower() in ["amount", "description"]:
             await handle_edit_field_choice(update, context)
             return
         
+        # Priorities 4 and 5 both need a number; parse it once (ASCII only, int() rejects e.g. "²") and hand it over
+        if not (text.isascii() and text.isdigit()):
+            return
+        choice = int(text)
+        
         # Priority 4: Selecting entry number to edit
-        if context.user_data.get("edit_entries") and text.isdigit():
-            await handle_edit_number(update, context)
+        if user_data.get("edit_entries"):
+            await handle_edit_number(update, context, choice)
             return
         
         # Priority 5: Selecting entry number to delete
-        if context.user_data.get("delete_entries") and text.isdigit():
-            await handle_delete_number(update, context)
+        if user_data.get("delete_entries"):
+            await handle_delete_number(update, context, choice)
             return
     
     application.add_handler(MessageHandler(
@@ -3142,21 +3489,13 @@ def main():
         )
     
     # Help command handler
-    application.add_handler(CommandHandler("help", help_command))
+    application.add_handler(CommandHandler("help", help_command, block=False))
     
     # Categories command handler
-    application.add_handler(CommandHandler("categories", categories_command))
+    application.add_handler(CommandHandler("categories", categories_command, block=False))
     
     # Unknown command handler - must be last
-    application.add_handler(MessageHandler(filters.COMMAND, unknown_command))
-    
-    # Setup graceful shutdown
-    def signal_handler(sig, frame):
-        logger.info("Shutdown signal received, stopping bot...")
-        sys.exit(0)
-    
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    application.add_handler(MessageHandler(filters.COMMAND, unknown_command, block=False))
     
     # Global error handlers
     def handle_exception(exc_type, exc_value, exc_traceback):
@@ -3172,7 +3511,16 @@ def main():
     logger.info("Bot starting...")
     
     try:
-        application.run_polling(allowed_updates=Update.ALL_TYPES, drop_pending_updates=True)
+        # Only plain messages are handled; long polls return up to 100 updates per request.
+        # On SIGINT/SIGTERM, PTB finishes in-flight updates, then stop_write_queue flushes pending writes.
+        application.run_polling(
+            stop_signals=(signal.SIGINT, signal.SIGTERM),
+            allowed_updates=[Update.MESSAGE],
+            timeout=30,
+            poll_interval=0.0,
+            bootstrap_retries=-1,
+            drop_pending_updates=True
+        )
     except Exception as e:
         logger.critical(f"FATAL: Bot crashed: {e}", exc_info=True)
         sys.exit(1)
@@ -0,0 +1,56 @@
+"""Tests for parse_short_date, the DD/MM/YY parser behind the specific-day handlers"""
+import importlib.util
+import os
+import sys
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+HAS_TELEGRAM = importlib.util.find_spec("telegram") is not None
+
+# Inputs as the handlers pass them (already stripped)
+ASCII_CASES = [
+    "03/02/26", "3/2/26", "31/12/99", "29/02/24", "01/01/69", "01/01/68",
+    "1/2/6", "01/02/026", "1/1/2026", "003/02/26", "31/02/26", "00/01/26",
+    "3/13/26", "3/0/26", "03-02-26", "03/02", "03/02/26/1", "aa/bb/cc",
+    "+3/2/26", "3/+2/26", "", "//",
+]
+
+# strptime rejects the first and accepts the second (Unicode digits match %y); both are rejected here
+NON_ASCII_CASES = ["١/٢/٢٦", "03/02/٢٦"]
+
+
+def strptime_result(text: str):
+    """Reference result from strptime, or None if it rejects the input"""
+    try:
+        return datetime.strptime(text, "%d/%m/%y").strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+@unittest.skipUnless(HAS_TELEGRAM, "python-telegram-bot is not installed")
+class ParseShortDateTest(unittest.TestCase):
+    def setUp(self):
+        from bot import parse_short_date
+        self.parse = parse_short_date
+
+    def parse_or_none(self, text: str):
+        try:
+            return self.parse(text)
+        except ValueError:
+            return None
+
+    def test_matches_strptime_on_ascii_input(self):
+        for text in ASCII_CASES:
+            with self.subTest(text=text):
+                self.assertEqual(self.parse_or_none(text), strptime_result(text))
+
+    def test_rejects_non_ascii_digits(self):
+        for text in NON_ASCII_CASES:
+            with self.subTest(text=text):
+                self.assertIsNone(self.parse_or_none(text))
+
+
+if __name__ == "__main__":
+    unittest.main()